@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from collections.abc import Callable
-from typing import Any, Self, override
+from typing import Any, Protocol, Self, override
 
 
 class ICommand(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def execute(self) -> None: ...
 
@@ -22,19 +24,31 @@ class MacroCommand(ICommand):
 
 
 class LambdaCommand(ICommand):
-    def __init__(self, func: Callable[..., None]) -> None:
+    def __init__(self, func: Callable[..., None], *args: Any, **kwargs: Any) -> None:
         self._func = func
-        self._args = []
-        self._kwargs = {}
-
-    def setup(self, *args: Any, **kwargs: Any) -> Self:
         self._args = args
         self._kwargs = kwargs
-        return self
+
+    def setup(self, *args: Any, **kwargs: Any) -> Self:
+        """
+        Возвращает новую команду с переданными аргументами, не изменяя текущую,
+        поэтому LambdaCommand(func).setup можно резолвить из нескольких потоков
+        """
+        return type(self)(self._func, *args, **kwargs)
 
     @override
     def execute(self) -> None:
         self._func(*self._args, **self._kwargs)
 
 
+class Action(Protocol):
+    """
+    Действие, которое выполняется сразу при вызове и ничего не возвращает.
+    Регистрируется в IoC вместо LambdaCommand(func).setup там, где команда не нужна
+    (*.Set, MessageHandler.*): не создает объектов и не хранит общего состояния.
+    """
+
+    def __call__(self, *args: Any) -> None: ...
+
+
 class CommandError(Exception): ...
@@ -10,9 +10,35 @@ class ResolveStrategy(Protocol):
     def __call__(self, dependency: str, *args: Any, **kwargs: Any) -> Any: ...
 
 
+class Resolver[T](Protocol):
+    """
+    Заранее привязанный к зависимости резолвер:
+    вызов resolver(*args) эквивалентен IoC.resolve(dependency, *args)
+    """
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T: ...
+
+    def strategy(self) -> Callable[..., T]:
+        """
+        Текущая стратегия зависимости, чтобы вызывать ее напрямую
+        """
+        ...
+
+
+class Version(Protocol):
+    """
+    Версия хранилищ текущего скоупа IoC и его предков: меняется при регистрации
+    зависимости в любом из них.
+    Пока она не изменилась, полученные через Resolver.strategy стратегии актуальны.
+    """
+
+    @property
+    def value(self) -> int: ...
+
+
 def _default_ioc_resolve_strategy(dependency: str, *args: Any, **kwargs: Any) -> Any:
     if dependency == "Update IoC Resolve Strategy":
-        return LambdaCommand(_update_ioc_resolve_strategy).setup(*args, **kwargs)
+        return LambdaCommand(_update_ioc_resolve_strategy, *args, **kwargs)
     raise IoCResolveDependencyError(f"Dependency '{dependency}' not found")
 
 
@@ -3,7 +3,7 @@ from contextvars import ContextVar
 from typing import Any, Protocol
 
 from app.core.command import ICommand, LambdaCommand
-from app.core.ioc import IoC, ResolveStrategy
+from app.core.ioc import IoC, IoCResolveDependencyError, ResolveStrategy
 
 
 class IoCDependency(Protocol):
@@ -11,14 +11,49 @@ class IoCDependency(Protocol):
 
 
 class Scope:
-    def __init__(self, name: str, store: dict[str, IoCDependency]) -> None:
+    def __init__(
+        self, name: str, store: dict[str, IoCDependency], parent: "Scope | None" = None
+    ) -> None:
         self.name = name
         self.store = store
+        self.parent = parent
+
+        # Метка последней записи в хранилище этого скоупа (см. ScopedIoC._chain_version)
+        self.version: int = 0
+        # Версия цепочки скоупа и последняя метка ScopedIoC, при которой она посчитана
+        self.chain: tuple[int, int] = (-1, 0)
+
+        # Кэш найденных по цепочке родителей стратегий.
+        # Валиден, пока cache_version совпадает с версией цепочки скоупа
+        self.cache: dict[str, IoCDependency] = {}
+        self.cache_version: int = -1
+
+        self.resolvers: dict[str, ScopedResolver] = {}
 
     def __repr__(self) -> str:
         return f"Scope(name={self.name}, keys={list(self.store.keys())})"
 
 
+class ScopeVersion:
+    """
+    Версия хранилищ скоупа и его предков
+    """
+
+    __slots__ = ("_ioc", "_scope")
+
+    def __init__(self, ioc: "ScopedIoC", scope: Scope) -> None:
+        self._ioc = ioc
+        self._scope = scope
+
+    @property
+    def value(self) -> int:
+        # Быстрый путь _chain_version: адаптеры проверяют версию при каждом вызове
+        checked, version = self._scope.chain
+        if checked == self._ioc._last_version:  # noqa: SLF001
+            return version
+        return self._ioc._chain_version(self._scope)  # noqa: SLF001
+
+
 class ScopedIoC:
     _current_scope: ContextVar[Scope | None] = ContextVar("_current_scope", default=None)
 
@@ -29,6 +64,11 @@ class ScopedIoC:
         self._setup_lock = threading.Lock()
         self._is_setup: bool = False
 
+        # Источник меток Scope.version: запись в хранилище скоупа инвалидирует кэши
+        # только этого скоупа и его потомков
+        self._last_version = 0
+        self._store_lock = threading.Lock()
+
     def setup(self) -> None:
         with self._setup_lock:
             if self._is_setup:
@@ -39,11 +79,17 @@ class ScopedIoC:
                 "IoC.Scope.Current.Clear": LambdaCommand(self._clear_scope).setup,
                 "IoC.Scope.Current": self._get_current_scope,
                 "IoC.Scope.Parent": self._get_parent_scope,
+                "IoC.Scope.Parent.Set": LambdaCommand(self._set_parent_scope).setup,
                 "IoC.Scope.Create": self._create_scope,
                 "IoC.Scope.Register": LambdaCommand(self._register_dependency).setup,
+                "IoC.Resolver": self._get_resolver,
+                "IoC.Registered": self._is_registered,
+                "IoC.Version": lambda: ScopeVersion(self, self._get_current_scope()),
             }
 
-            self._root_scope.store.update(default_store)
+            with self._store_lock:
+                self._root_scope.store.update(default_store)
+                self._bump_version(self._root_scope)
 
             def update_ioc_strategy(_old_strategy: ResolveStrategy) -> ResolveStrategy:
                 return self._resolve_strategy
@@ -65,23 +111,143 @@ class ScopedIoC:
         raise ScopedIoCError("Root scope has no parent scope")
 
     def _create_scope(self, name: str, parent: Scope | None = None) -> Scope:
-        new_scope = Scope(name, {})
         if not parent:
             parent = self._get_current_scope()
+        new_scope = Scope(name, {}, parent)
         new_scope.store["IoC.Scope.Parent"] = lambda: parent
         return new_scope
 
+    def _set_parent_scope(self, scope: Scope, parent: Scope) -> None:
+        with self._store_lock:
+            scope.parent = parent
+            scope.store["IoC.Scope.Parent"] = lambda: parent
+            self._bump_version(scope)
+
     def _register_dependency(self, dependency: str, dependency_func: IoCDependency) -> None:
-        self._get_current_scope().store[dependency] = dependency_func
+        scope = self._get_current_scope()
+        with self._store_lock:
+            scope.store[dependency] = dependency_func
+            self._bump_version(scope)
+
+    def _bump_version(self, scope: Scope) -> None:
+        """
+        Помечает запись в хранилище скоупа. Вызывается под _store_lock.
+        """
+        self._last_version += 1
+        scope.version = self._last_version
+
+    def _chain_version(self, scope: Scope) -> int:
+        """
+        Версия хранилищ скоупа и его предков - самая поздняя метка по цепочке.
+        Метки растут глобально, поэтому запись в любой скоуп цепочки или смена
+        родителя у любого из них меняет версию.
+        Цепочка обходится заново, только если с прошлого обхода была хоть одна запись.
+        """
+        last_version = self._last_version
+        checked, version = scope.chain
+        if checked == last_version:
+            return version
+
+        version = scope.version
+        parent = scope.parent
+        while parent is not None:
+            if parent.version > version:
+                version = parent.version
+            parent = parent.parent
+        # Одним присваиванием, чтобы другой поток не увидел версию от другого обхода
+        scope.chain = (last_version, version)
+        return version
+
+    def _get_resolver(self, dependency: str, scope: Scope | None = None) -> "ScopedResolver":
+        if not scope:
+            scope = self._get_current_scope()
+        # Резолвер запоминается в скоупе, только когда найдет стратегию (см. ScopedResolver._bind):
+        # запросы несуществующих зависимостей не копятся в scope.resolvers
+        return scope.resolvers.get(dependency) or ScopedResolver(self, scope, dependency)
+
+    def _is_registered(self, dependency: str) -> bool:
+        """
+        Зарегистрирована ли зависимость в текущем скоупе или его родителях.
+        В отличие от резолва, отсутствие зависимости не бросает исключение.
+        """
+        return self._lookup_strategy(self._get_current_scope(), dependency) is not None
 
     def _resolve_strategy(self, dependency: str, *args: Any, **kwargs: Any) -> Any:
         scope = self._get_current_scope()
-        while True:
-            if strategy := scope.store.get(dependency):
-                return strategy(*args, **kwargs)
-            if scope is self._root_scope:
-                raise ScopedIoCError(f"Could not resolve dependency '{dependency}'")
-            scope = scope.store["IoC.Scope.Parent"]()
+        if scope.cache_version == self._chain_version(scope) and (
+            strategy := scope.cache.get(dependency)
+        ):
+            return strategy(*args, **kwargs)
+        return self._find_strategy(scope, dependency)(*args, **kwargs)
+
+    def _find_strategy(self, scope: Scope, dependency: str) -> IoCDependency:
+        """
+        Ищет стратегию по цепочке родительских скоупов и кэширует её в исходном скоупе.
+        Результат не кэшируется, если во время поиска кто-то зарегистрировал зависимость.
+        """
+        version = self._chain_version(scope)
+
+        strategy = self._lookup_strategy(scope, dependency)
+        if strategy is None:
+            raise ScopedIoCError(f"Could not resolve dependency '{dependency}'")
+
+        with self._store_lock:
+            if version == self._chain_version(scope):
+                if scope.cache_version != version:
+                    scope.cache.clear()
+                    scope.cache_version = version
+                scope.cache[dependency] = strategy
+
+        return strategy
+
+    def _lookup_strategy(self, scope: Scope, dependency: str) -> IoCDependency | None:
+        current: Scope | None = scope
+        while current is not None:
+            if strategy := current.store.get(dependency):
+                return strategy
+            current = current.parent
+        return None
+
+
+class ScopedResolver:
+    """
+    Резолвер, привязанный к зависимости и скоупу.
+    Стратегия ищется при первом вызове и повторно только после
+    регистрации новых зависимостей, поэтому вызов почти не дороже вызова самой стратегии.
+    Исключения стратегии пробрасываются как есть.
+    """
+
+    __slots__ = ("_dependency", "_ioc", "_scope", "_strategy", "_version")
+
+    def __init__(self, ioc: ScopedIoC, scope: Scope, dependency: str) -> None:
+        self._ioc = ioc
+        self._scope = scope
+        self._dependency = dependency
+
+        self._strategy: IoCDependency | None = None
+        self._version: int = -1
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._version != self._ioc._chain_version(self._scope):  # noqa: SLF001
+            self._bind()
+        return self._strategy(*args, **kwargs)  # pyright: ignore[reportOptionalCall]
+
+    def strategy(self) -> IoCDependency:
+        if self._version != self._ioc._chain_version(self._scope):  # noqa: SLF001
+            self._bind()
+        return self._strategy  # pyright: ignore[reportReturnType]
+
+    def _bind(self) -> None:
+        version = self._ioc._chain_version(self._scope)  # noqa: SLF001
+        try:
+            self._strategy = self._ioc._find_strategy(self._scope, self._dependency)  # noqa: SLF001
+        except ScopedIoCError as e:
+            raise IoCResolveDependencyError(str(e)) from e
+        self._version = version
+        self._scope.resolvers.setdefault(self._dependency, self)
+
+    def __repr__(self) -> str:
+        return f"ScopedResolver(dependency={self._dependency}, scope={self._scope.name})"
 
 
 _scoped_ioc = ScopedIoC()
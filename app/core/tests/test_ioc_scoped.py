@@ -7,7 +7,7 @@ import pytest
 from loguru import logger
 
 from app.core.command import ICommand
-from app.core.ioc import IoC, IoCResolveDependencyError
+from app.core.ioc import IoC, IoCResolveDependencyError, Resolver, Version
 from app.core.ioc_scoped import Scope
 from app.core.ioc_scoped import setup as scoped_ioc_setup
 
@@ -40,6 +40,29 @@ def test_ioc_scope_ops() -> None:
     assert IoC[Scope].resolve("IoC.Scope.Current") is root_scope
 
 
+def test_set_parent_scope() -> None:
+    scope1 = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    scope2 = IoC[Scope].resolve("IoC.Scope.Create", "scope2")
+    child = IoC[Scope].resolve("IoC.Scope.Create", "child", scope1)
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+    mock1 = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", mock1).execute()
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope2).execute()
+    mock2 = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", mock2).execute()
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", child).execute()
+    IoC.resolve("mock")
+    mock1.assert_called_once()
+
+    IoC[ICommand].resolve("IoC.Scope.Parent.Set", child, scope2).execute()
+    assert IoC[Scope].resolve("IoC.Scope.Parent") is scope2
+    IoC.resolve("mock")
+    mock2.assert_called_once()
+    mock1.assert_called_once()
+
+
 def test_root_parent_error() -> None:
     with pytest.raises(IoCResolveDependencyError):
         IoC[Scope].resolve("IoC.Scope.Parent")
@@ -149,3 +172,120 @@ def test_thread_local_resolve() -> None:
         futures = [executor.submit(thread1_func), executor.submit(thread2_func)]
         for future in futures:
             future.result()
+
+
+def test_resolve_cache_invalidation() -> None:
+    """
+    Закэшированная в скоупе стратегия должна перерезолвиться
+    после регистрации зависимости в этом скоупе или любом его предке
+    """
+    scope1 = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    scope2 = IoC[Scope].resolve("IoC.Scope.Create", "scope2", scope1)
+
+    root_mock = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", root_mock).execute()
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope2).execute()
+    IoC.resolve("mock")
+    IoC.resolve("mock")
+    assert root_mock.call_count == 2
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+    parent_mock = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", parent_mock).execute()
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope2).execute()
+    IoC.resolve("mock")
+    parent_mock.assert_called_once()
+
+    current_mock = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", current_mock).execute()
+    IoC.resolve("mock")
+    current_mock.assert_called_once()
+    assert root_mock.call_count == 2
+    parent_mock.assert_called_once()
+
+
+def test_version_per_scope() -> None:
+    """
+    Регистрация в скоупе меняет версию только этого скоупа и его потомков
+    """
+    parent = IoC[Scope].resolve("IoC.Scope.Create", "parent")
+    scope1 = IoC[Scope].resolve("IoC.Scope.Create", "scope1", parent)
+    scope2 = IoC[Scope].resolve("IoC.Scope.Create", "scope2", parent)
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+    version = IoC[Version].resolve("IoC.Version")
+    value = version.value
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope2).execute()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", Mock()).execute()
+    assert version.value == value
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", parent).execute()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", Mock()).execute()
+    assert version.value != value
+
+    # Смена родителя тоже меняет версию
+    value = version.value
+    IoC[ICommand].resolve("IoC.Scope.Parent.Set", scope1, scope2).execute()
+    assert version.value != value
+
+
+def test_resolver() -> None:
+    scope1 = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+
+    mock1 = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", mock1).execute()
+
+    resolver = IoC[Resolver[Any]].resolve("IoC.Resolver", "mock")
+    resolver(*MOCK_ARGS, **MOCK_KWARGS)
+    mock1.assert_called_once_with(*MOCK_ARGS, **MOCK_KWARGS)
+    # Нашедший стратегию резолвер переиспользуется
+    assert IoC[Resolver[Any]].resolve("IoC.Resolver", "mock") is resolver
+
+    # Резолвер привязан к скоупу, в котором был получен
+    IoC[ICommand].resolve("IoC.Scope.Current.Clear").execute()
+    resolver()
+    assert mock1.call_count == 2
+
+    # После перерегистрации резолвер находит новую стратегию
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+    mock2 = Mock()
+    IoC[ICommand].resolve("IoC.Scope.Register", "mock", mock2).execute()
+    resolver()
+    mock2.assert_called_once()
+    assert mock1.call_count == 2
+
+
+def test_resolver_error() -> None:
+    resolver = IoC[Resolver[Any]].resolve("IoC.Resolver", "Nonexistent Dependency")
+    with pytest.raises(IoCResolveDependencyError):
+        resolver()
+
+
+def test_registered() -> None:
+    scope1 = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope1).execute()
+    IoC[ICommand].resolve("IoC.Scope.Register", "registered_mock", Mock()).execute()
+    assert IoC[bool].resolve("IoC.Registered", "registered_mock")
+
+    scope2 = IoC[Scope].resolve("IoC.Scope.Create", "scope2", scope1)
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", scope2).execute()
+    assert IoC[bool].resolve("IoC.Registered", "registered_mock")
+    assert not IoC[bool].resolve("IoC.Registered", "Nonexistent Dependency")
+    assert not scope2.resolvers
+
+    IoC[ICommand].resolve("IoC.Scope.Current.Clear").execute()
+    assert not IoC[bool].resolve("IoC.Registered", "registered_mock")
+
+
+def test_resolver_not_memoized_on_error() -> None:
+    scope = IoC[Scope].resolve("IoC.Scope.Current")
+    resolvers = len(scope.resolvers)
+    for i in range(10):
+        resolver = IoC[Resolver[Any]].resolve("IoC.Resolver", f"Nonexistent Dependency {i}")
+        with pytest.raises(IoCResolveDependencyError):
+            resolver()
+    assert len(scope.resolvers) == resolvers
@@ -1,11 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 import uvicorn
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from app.core.ioc import IoC
-from app.server import Message, Server
+from app.server import InvalidMessageError, Message, Server, UnknownGameError
 
 app = FastAPI(title="Space Battle Server")
 
@@ -24,7 +26,70 @@ def new_game(server: ServerDep) -> int:
 
 @app.post("/message")
 def post_message(message: Message, server: ServerDep) -> None:
-    server.receive_message(message)
+    try:
+        server.receive_message(message)
+    except UnknownGameError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e)) from e
+    except InvalidMessageError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, str(e)) from e
+
+
+@app.post("/messages")
+def post_messages(messages: list[Message], server: ServerDep) -> None:
+    try:
+        server.receive_messages(messages)
+    except UnknownGameError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e)) from e
+    except InvalidMessageError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, str(e)) from e
+
+
+class GameMessage(BaseModel):
+    """
+    Сообщение в WebSocket игры: game_id задается при подключении
+    """
+
+    object_id: int
+    op_id: str
+    args: dict[str, Any]
+
+
+_game_messages = TypeAdapter(list[GameMessage] | GameMessage)
+
+
+@app.websocket("/game/{game_id}/ws")
+async def game_websocket(websocket: WebSocket, game_id: int, server: ServerDep) -> None:
+    """
+    Постоянное соединение агента с игрой. Агент шлет сообщение или список сообщений,
+    на каждое получает {"ack": число принятых сообщений} или {"error": текст}
+    """
+    if not server.has_game(game_id):
+        await websocket.close(status.WS_1008_POLICY_VIOLATION, f"Game {game_id} does not exist")
+        return
+
+    await websocket.accept()
+    logger.info(f"Agent connected to game {game_id}")
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                received = _game_messages.validate_json(data)
+                if isinstance(received, GameMessage):
+                    received = [received]
+                # Декодирование и блокировка маршрутизации не должны останавливать цикл событий
+                await run_in_threadpool(
+                    server.receive_messages,
+                    [
+                        Message(game_id=game_id, object_id=m.object_id, op_id=m.op_id, args=m.args)
+                        for m in received
+                    ],
+                )
+            except (ValidationError, InvalidMessageError, UnknownGameError) as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            await websocket.send_json({"ack": len(received)})
+    except WebSocketDisconnect:
+        logger.info(f"Agent disconnected from game {game_id}")
 
 
 def start() -> None:
@@ -0,0 +1,68 @@
+from typing import override
+
+import numpy as np
+from loguru import logger
+
+from app.core.command import ICommand
+from app.game.spatial import SpatialGrid
+from app.game.world import World
+
+
+class HitDetectionCommand(ICommand):
+    """
+    Попадания торпед (projectile) в цели (collision_radius) за квант.
+    Проверяется весь отрезок движения торпеды от позиции на прошлой проверке
+    до текущей, поэтому быстрая торпеда не пролетает цель насквозь между квантами.
+    Кандидаты берутся из SpatialGrid, а не перебором всех пар.
+    Попавшая торпеда и пораженная цель отключаются (disabled).
+    """
+
+    __slots__ = ("_grid", "_world")
+
+    def __init__(self, world: World, grid: SpatialGrid) -> None:
+        self._world = world
+        self._grid = grid
+
+    @override
+    def execute(self) -> None:
+        world = self._world
+        start, end = self._grid.start, world.position
+        active = ~world.disabled
+        projectiles = np.flatnonzero(
+            world.mask("movable_position", "projectile") & world.projectile & active
+        )
+        targets = world.mask("movable_position", "collision_radius") & ~world.projectile & active
+
+        hits: list[tuple[int, int]] = []
+        for projectile in projectiles.tolist():
+            a, b = start[projectile], end[projectile]
+            candidates = [c for c in self._grid.query(a, b) if targets[c]]
+            if not candidates:
+                continue
+
+            rows = np.array(candidates)
+            centers = end[rows].astype(np.float64)
+            # Ближайшая к центру цели точка отрезка a-b: a + t * (b - a), t в [0, 1]
+            direction = (b - a).astype(np.float64)
+            length2 = direction @ direction
+            t = np.zeros(len(rows))
+            if length2:
+                t = np.clip((centers - a) @ direction / length2, 0, 1)
+            closest = a + t[:, None] * direction
+            hit = ((centers - closest) ** 2).sum(axis=1) <= world.collision_radius[rows] ** 2
+            if not hit.any():
+                continue
+
+            # Торпеда поражает первую цель на своем пути
+            target = rows[hit][np.argmin(t[hit])].item()
+            targets[target] = False
+            hits.append((projectile, target))
+
+        for projectile, target in hits:
+            logger.info(
+                f"Object {world.object_ids[projectile]} hit object {world.object_ids[target]}"
+            )
+            world.set_property(target, "disabled", value=True)
+            world.set_property(projectile, "disabled", value=True)
+
+        self._grid.reset_start()
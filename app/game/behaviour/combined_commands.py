@@ -9,6 +9,8 @@ from app.game.value_types import Vector
 
 
 class AdjustVelocityToRotationCommand(ICommand):
+    __slots__ = ("_can_change_velocity", "_rotatable")
+
     def __init__(self, rotatable: IRotatable, can_change_velocity: ICanChangeVelocity) -> None:
         self._rotatable = rotatable
         self._can_change_velocity = can_change_velocity
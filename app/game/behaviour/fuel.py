@@ -19,6 +19,8 @@ class IConsumesFuel(ABC):
 
 
 class CheckFuelCommand(ICommand):
+    __slots__ = ("_consumer",)
+
     def __init__(self, consumer: IConsumesFuel) -> None:
         self._consumer = consumer
 
@@ -32,6 +34,8 @@ class CheckFuelCommand(ICommand):
 
 
 class BurnFuelCommand(ICommand):
+    __slots__ = ("_consumer",)
+
     def __init__(self, consumer: IConsumesFuel) -> None:
         self._consumer = consumer
 
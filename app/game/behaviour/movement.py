@@ -21,6 +21,8 @@ class IMovable(ABC):
 
 
 class MoveCommand(ICommand):
+    __slots__ = ("_movable",)
+
     def __init__(self, movable: IMovable) -> None:
         self._movable = movable
 
@@ -20,6 +20,8 @@ class IRotatable(ABC):
 
 
 class RotateCommand(ICommand):
+    __slots__ = ("_rotatable",)
+
     def __init__(self, rotatable: IRotatable) -> None:
         self._rotatable = rotatable
 
@@ -0,0 +1,184 @@
+"""
+Системы: команды, которые за один вызов обновляют объекты World игры
+векторными операциями. Результат совпадает с покомандным выполнением
+MoveCommand, RotateCommand, BurnFuelCommand и AdjustVelocityToRotationCommand.
+Как и команда, система обрабатывает объект один раз на просьбу:
+только объекты, для которых на этот квант вызвали World.request(indices, <система>).
+"""
+
+import math
+from functools import cache
+from typing import override
+
+import numpy as np
+import numpy.typing as npt
+from loguru import logger
+
+from app.core.command import ICommand
+from app.game.value_types import DEFAULT_DIRECTIONS_NUMBER, trig_table
+from app.game.world import World
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# atan2 считается через math, а не np.arctan2: последний может отличаться в последнем бите
+_atan2 = np.frompyfunc(math.atan2, 2, 1)
+
+# Имена систем для World.request
+MOVE = "Move"
+ROTATE = "Rotate"
+BURN_FUEL = "BurnFuel"
+ADJUST_VELOCITY = "AdjustVelocityToRotation"
+
+
+@cache
+def _trig_table(directions_number: int) -> tuple[FloatArray, FloatArray]:
+    """
+    Таблицы value_types.trig_table в виде массивов
+    """
+    cos, sin = trig_table(directions_number)
+    return np.array(cos), np.array(sin)
+
+
+def _cos_sin(angles: IntArray) -> tuple[FloatArray, FloatArray]:
+    """
+    cos и sin для массива углов (direction, directions_number)
+    """
+    directions, numbers = angles[:, 0], angles[:, 1]
+    cos = np.empty(len(angles))
+    sin = np.empty(len(angles))
+    for number in np.unique(numbers).tolist():
+        rows = numbers == number
+        cos_table, sin_table = _trig_table(number)
+        cos[rows] = cos_table[directions[rows]]
+        sin[rows] = sin_table[directions[rows]]
+    return cos, sin
+
+
+def _velocity(angles: IntArray, lengths: FloatArray) -> tuple[FloatArray, FloatArray]:
+    """
+    Как Vector.from_angle_and_length: round совпадает с np.rint (округление к четному).
+    + 0.0 превращает -0.0 в 0.0, как у целых координат Vector, иначе atan2 даст другой угол
+    """
+    cos, sin = _cos_sin(angles)
+    return np.rint(lengths * cos) + 0.0, np.rint(lengths * sin) + 0.0
+
+
+def _has_fuel(world: World) -> npt.NDArray[np.bool_]:
+    """
+    Правило CheckFuelCommand: топлива не меньше, чем расходуется за ход
+    """
+    return world.mask("fuel_amount", "fuel_consumption") & (
+        world.fuel_amount >= world.fuel_consumption
+    )
+
+
+class MoveSystemCommand(ICommand):
+    """
+    Сдвигает движущиеся объекты (MOVE) на их скорость.
+    Объекты, которым не хватает топлива, стоят на месте.
+    """
+
+    __slots__ = ("_world",)
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+
+    @override
+    def execute(self) -> None:
+        world = self._world
+        mask = world.take_requests(MOVE)
+        mask &= world.mask("movable_position", "movable_angle", "movable_abs_velocity")
+        mask &= ~world.mask("fuel_amount", "fuel_consumption") | _has_fuel(world)
+
+        rows = np.flatnonzero(mask)
+        logger.debug(f"Moving {len(rows)} objects")
+        vx, vy = _velocity(world.movable_angle[rows], world.abs_velocity[rows])
+        world.position[rows, 0] += vx.astype(np.int64)
+        world.position[rows, 1] += vy.astype(np.int64)
+        world.changed(rows, "movable_position")
+
+
+class RotateSystemCommand(ICommand):
+    """
+    Поворачивает вращающиеся объекты (ROTATE) на их угловую скорость
+    """
+
+    __slots__ = ("_world",)
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+
+    @override
+    def execute(self) -> None:
+        world = self._world
+        rows = np.flatnonzero(
+            world.take_requests(ROTATE)
+            & world.mask("rotatable_angle", "rotatable_angular_velocity")
+        )
+        angles, velocities = world.rotatable_angle[rows], world.angular_velocity[rows]
+
+        # Углы с разным числом направлений не складываются (AngleAdditionError)
+        same = angles[:, 1] == velocities[:, 1]
+        if not same.all():
+            logger.warning(
+                f"Cannot rotate objects {rows[~same].tolist()}: "
+                "angle and angular velocity have different direction numbers"
+            )
+        rows, angles, velocities = rows[same], angles[same], velocities[same]
+
+        logger.debug(f"Rotating {len(rows)} objects")
+        world.rotatable_angle[rows, 0] = (angles[:, 0] + velocities[:, 0]) % angles[:, 1]
+        world.changed(rows, "rotatable_angle")
+
+
+class BurnFuelSystemCommand(ICommand):
+    """
+    Списывает расход топлива у объектов (BURN_FUEL), которым его хватает
+    """
+
+    __slots__ = ("_world",)
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+
+    @override
+    def execute(self) -> None:
+        world = self._world
+        rows = np.flatnonzero(world.take_requests(BURN_FUEL) & _has_fuel(world))
+        logger.debug(f"Burning fuel for {len(rows)} objects")
+        world.fuel_amount[rows] -= world.fuel_consumption[rows]
+        world.changed(rows, "fuel_amount")
+
+
+class AdjustVelocityToRotationSystemCommand(ICommand):
+    """
+    Направляет скорость движущихся вращающихся объектов (ADJUST_VELOCITY)
+    по их углу поворота, сохраняя модуль скорости
+    """
+
+    __slots__ = ("_world",)
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+
+    @override
+    def execute(self) -> None:
+        world = self._world
+        rows = np.flatnonzero(
+            world.take_requests(ADJUST_VELOCITY)
+            & world.mask("rotatable_angle", "movable_angle", "movable_abs_velocity")
+        )
+        logger.debug(f"Adjusting velocity of {len(rows)} objects")
+
+        vx, vy = _velocity(world.movable_angle[rows], world.abs_velocity[rows])
+        lengths = np.sqrt(vx * vx + vy * vy)
+        nx, ny = _velocity(world.rotatable_angle[rows], lengths)
+
+        # Как ICanChangeVelocity.velocity.Set: угол из atan2 с числом направлений по умолчанию
+        rads = _atan2(ny, nx).astype(np.float64)
+        directions = np.rint(rads / 2 / math.pi * DEFAULT_DIRECTIONS_NUMBER).astype(np.int64)
+        world.movable_angle[rows, 0] = directions % DEFAULT_DIRECTIONS_NUMBER
+        world.movable_angle[rows, 1] = DEFAULT_DIRECTIONS_NUMBER
+        world.abs_velocity[rows] = np.sqrt(nx * nx + ny * ny)
+        world.changed(rows, "movable_angle", "movable_abs_velocity")
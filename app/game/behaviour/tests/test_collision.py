@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.game.behaviour.systems import MOVE
+from app.game.setup.behaviour import ioc_setup_systems
+from app.game.spatial import SpatialGrid
+from app.game.uobject import UObject
+from app.game.value_types import Angle, Vector
+from app.game.world import World, WorldObject
+
+
+@pytest.fixture(autouse=True)
+def _ioc_setup() -> None:
+    ioc_setup_systems()
+
+
+def make_ship(world: World, position: Vector, radius: float = 5) -> UObject:
+    ship = world.create()
+    ship.set_property("movable_position", position)
+    ship.set_property("collision_radius", radius)
+    return ship
+
+
+def make_torpedo(world: World, position: Vector, angle: Angle, speed: int) -> WorldObject:
+    torpedo = world.create()
+    torpedo.set_property("movable_position", position)
+    torpedo.set_property("movable_angle", angle)
+    torpedo.set_property("movable_abs_velocity", speed)
+    torpedo.set_property("projectile", value=True)
+    return torpedo
+
+
+def test_fast_torpedo_hits() -> None:
+    world = World()
+    systems = IoC[ICommand].resolve("Game.Systems", world)
+    ship = make_ship(world, Vector(500, 3))
+    far_ship = make_ship(world, Vector(900, 0))
+    # За квант торпеда пролетает 1000: и ее начальная, и конечная точки далеко от целей
+    torpedo = make_torpedo(world, Vector(0, 0), Angle(0), 1000)
+
+    world.request([torpedo.index], MOVE)
+    systems.execute()
+
+    assert torpedo.get_property("movable_position") == Vector(1000, 0)
+    assert ship.get_property("disabled")
+    assert torpedo.get_property("disabled")
+    # Торпеда поражает только первую цель на пути
+    with pytest.raises(KeyError):
+        far_ship.get_property("disabled")
+
+
+def test_torpedo_misses() -> None:
+    world = World()
+    systems = IoC[ICommand].resolve("Game.Systems", world)
+    ship = make_ship(world, Vector(500, 20))
+    torpedo = make_torpedo(world, Vector(0, 0), Angle(0), 1000)
+
+    world.request([torpedo.index], MOVE)
+    systems.execute()
+    # Торпеда не отключена и продолжает полет
+    world.request([torpedo.index], MOVE)
+    systems.execute()
+
+    assert torpedo.get_property("movable_position") == Vector(2000, 0)
+    with pytest.raises(KeyError):
+        ship.get_property("disabled")
+
+
+def test_grid_incremental_update() -> None:
+    world = World(capacity=1)
+    grid = SpatialGrid(world, cell_size=10)
+    ship = make_ship(world, Vector(0, 0), radius=1)
+    make_ship(world, Vector(100, 100), radius=1)
+
+    def query(x: int, y: int) -> set[int]:
+        point = np.array([x, y])
+        return grid.query(point, point)
+
+    assert query(0, 0) == {0}
+    ship.set_property("movable_position", Vector(55, 55))
+    assert query(0, 0) == set()
+    assert query(55, 55) == {0}
+    assert query(100, 100) == {1}
+
+    world.remove(1)
+    assert query(100, 100) == set()
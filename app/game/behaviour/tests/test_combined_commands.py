@@ -2,7 +2,7 @@ from unittest.mock import Mock
 
 import pytest
 
-from app.core.command import CommandError, ICommand, MacroCommand
+from app.core.command import CommandError, ICommand, LambdaCommand, MacroCommand
 from app.core.ioc import IoC
 from app.game.behaviour.combined_commands import AdjustVelocityToRotationCommand
 from app.game.behaviour.fuel import (
@@ -58,6 +58,22 @@ def test_macrocommand_error() -> None:
         mc.execute()
 
 
+def test_lambda_command_setup() -> None:
+    """
+    setup не должен менять общую команду: каждый вызов возвращает свою
+    """
+    func = Mock()
+    factory = LambdaCommand(func).setup
+    cmd1 = factory(1, a=2)
+    cmd2 = factory(3)
+    assert cmd1 is not cmd2
+
+    cmd1.execute()
+    func.assert_called_once_with(1, a=2)
+    cmd2.execute()
+    func.assert_called_with(3)
+
+
 def test_move_and_burn_fuel() -> None:
     uobj = MockUObject()
     make_movable_uobject(position=Vector(0, 0), velocity=Vector(1, 0), uobj=uobj)
@@ -85,3 +85,10 @@ def test_movable_position_error() -> None:
 
     with pytest.raises(Exception):
         MoveCommand(IoC[IMovable].resolve("Adapter", IMovable, uobj)).execute()
+
+
+def test_move_command_has_no_dict() -> None:
+    uobj = make_movable_uobject(Vector(0, 0), Vector(1, 1))
+    command = MoveCommand(IoC[IMovable].resolve("Adapter", IMovable, uobj))
+
+    assert not hasattr(command, "__dict__")
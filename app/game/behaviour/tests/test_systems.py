@@ -0,0 +1,193 @@
+import random
+from contextlib import suppress
+
+import pytest
+
+from app.core.command import CommandError, ICommand, MacroCommand
+from app.core.ioc import IoC
+from app.game.behaviour.combined_commands import AdjustVelocityToRotationCommand
+from app.game.behaviour.fuel import BurnFuelCommand, CheckFuelCommand, IConsumesFuel
+from app.game.behaviour.movement import ICanChangeVelocity, IMovable, MoveCommand
+from app.game.behaviour.rotation import IRotatable, RotateCommand
+from app.game.behaviour.systems import (
+    ADJUST_VELOCITY,
+    BURN_FUEL,
+    MOVE,
+    ROTATE,
+    AdjustVelocityToRotationSystemCommand,
+    BurnFuelSystemCommand,
+    MoveSystemCommand,
+    RotateSystemCommand,
+)
+from app.game.setup.adapters import ioc_setup_adapters
+from app.game.setup.behaviour import (
+    ioc_setup_icanchangevelocity,
+    ioc_setup_iconsumesfuel,
+    ioc_setup_imovable,
+    ioc_setup_irotatable,
+    ioc_setup_systems,
+)
+from app.game.uobject import UObject, UObjectImpl
+from app.game.value_types import Angle, Vector
+from app.game.world import World, WorldObject
+
+OBJECTS = 300
+TICKS = 20
+
+PROPERTIES = (
+    "movable_position",
+    "movable_angle",
+    "movable_abs_velocity",
+    "rotatable_angle",
+    "rotatable_angular_velocity",
+    "fuel_amount",
+    "fuel_consumption",
+)
+
+
+@pytest.fixture(autouse=True)
+def _ioc_setup() -> None:
+    ioc_setup_imovable()
+    ioc_setup_irotatable()
+    ioc_setup_icanchangevelocity()
+    ioc_setup_iconsumesfuel()
+    ioc_setup_adapters()
+
+
+def _random_properties(rng: random.Random) -> dict[str, object]:
+    directions = rng.choice([8, 36, 72])
+    props: dict[str, object] = {
+        "movable_position": Vector(rng.randint(-1000, 1000), rng.randint(-1000, 1000)),
+        "movable_angle": Angle(rng.randrange(directions), directions),
+        "movable_abs_velocity": rng.choice([rng.randint(0, 50), rng.uniform(0, 50)]),
+        "rotatable_angle": Angle(rng.randrange(72)),
+        "rotatable_angular_velocity": Angle(rng.randrange(72)),
+        "fuel_amount": rng.randint(0, 100),
+        "fuel_consumption": rng.randint(1, 10),
+    }
+    # Часть объектов без некоторых свойств: системы должны их пропускать
+    for prop in rng.sample(PROPERTIES, rng.choice([0, 0, 1, 2])):
+        del props[prop]
+    return props
+
+
+def _tick(uobj: UObject) -> None:
+    """
+    Покомандный ход одного объекта в том же порядке, что и Game.Systems
+    """
+
+    def adapter[T](interface: type[T]) -> T:
+        return IoC[T].resolve("Adapter", interface, uobj)
+
+    def run(cmd: ICommand) -> None:
+        with suppress(KeyError, CommandError):
+            cmd.execute()
+
+    run(RotateCommand(adapter(IRotatable)))
+    run(AdjustVelocityToRotationCommand(adapter(IRotatable), adapter(ICanChangeVelocity)))
+    consumer = adapter(IConsumesFuel)
+    try:
+        uobj.get_property("fuel_amount")
+        uobj.get_property("fuel_consumption")
+    except KeyError:
+        run(MoveCommand(adapter(IMovable)))
+    else:
+        run(MacroCommand([CheckFuelCommand(consumer), MoveCommand(adapter(IMovable))]))
+    run(MacroCommand([CheckFuelCommand(consumer), BurnFuelCommand(consumer)]))
+
+
+def _state(uobj: UObject) -> dict[str, object]:
+    state: dict[str, object] = {}
+    for prop in PROPERTIES:
+        try:
+            value = uobj.get_property(prop)
+        except KeyError:
+            continue
+        state[prop] = (
+            (value.direction, value.directions_number) if isinstance(value, Angle) else value
+        )
+    return state
+
+
+def test_systems_match_commands() -> None:
+    rng = random.Random(42)
+    world = World()
+    pairs: list[tuple[UObject, WorldObject]] = []
+    for _ in range(OBJECTS):
+        scalar, stored = UObjectImpl(), world.create()
+        for prop, value in _random_properties(rng).items():
+            scalar.set_property(prop, value)
+            stored.set_property(prop, value)
+        pairs.append((scalar, stored))
+
+    ioc_setup_systems()
+    systems = IoC[ICommand].resolve("Game.Systems", world)
+    rows = [stored.index for _scalar, stored in pairs]
+    for _ in range(TICKS):
+        for scalar, _stored in pairs:
+            _tick(scalar)
+        for system in (ROTATE, ADJUST_VELOCITY, MOVE, BURN_FUEL):
+            world.request(rows, system)
+        systems.execute()
+
+    for scalar, stored in pairs:
+        assert _state(stored) == _state(scalar)
+
+
+def test_move_system_fuel_mask() -> None:
+    world = World()
+    moving, empty = world.create(), world.create()
+    for uobj in (moving, empty):
+        uobj.set_property("movable_position", Vector(0, 0))
+        uobj.set_property("movable_angle", Angle(0))
+        uobj.set_property("movable_abs_velocity", 3)
+        uobj.set_property("fuel_consumption", 2)
+    moving.set_property("fuel_amount", 2)
+    empty.set_property("fuel_amount", 1)
+    for system in (MOVE, BURN_FUEL, ROTATE, ADJUST_VELOCITY):
+        world.request([moving.index, empty.index], system)
+
+    MoveSystemCommand(world).execute()
+    BurnFuelSystemCommand(world).execute()
+    RotateSystemCommand(world).execute()
+    AdjustVelocityToRotationSystemCommand(world).execute()
+
+    assert moving.get_property("movable_position") == Vector(3, 0)
+    assert moving.get_property("fuel_amount") == 0
+    assert empty.get_property("movable_position") == Vector(0, 0)
+    assert empty.get_property("fuel_amount") == 1
+
+
+def test_systems_invalidate_derived_velocity() -> None:
+    world = World()
+    uobj = world.create()
+    uobj.set_property("movable_position", Vector(0, 0))
+    uobj.set_property("movable_angle", Angle(0))
+    uobj.set_property("movable_abs_velocity", 10)
+    uobj.set_property("rotatable_angle", Angle.from_degrees(90))
+
+    movable = IoC[IMovable].resolve("Adapter", IMovable, uobj)
+    assert movable.get_velocity() == Vector(10, 0)
+
+    # Система пишет угол в массив напрямую: закешированная скорость должна сброситься
+    world.request([uobj.index], ADJUST_VELOCITY)
+    AdjustVelocityToRotationSystemCommand(world).execute()
+    assert movable.get_velocity() == Vector(0, 10)
+
+
+def test_system_runs_once_per_request() -> None:
+    world = World()
+    requested, idle = world.create(), world.create()
+    for uobj in (requested, idle):
+        uobj.set_property("movable_position", Vector(0, 0))
+        uobj.set_property("movable_angle", Angle(0))
+        uobj.set_property("movable_abs_velocity", 3)
+
+    move = MoveSystemCommand(world)
+    world.request([requested.index], MOVE)
+    move.execute()
+    # Просьба сброшена после шага: второй квант объект стоит
+    move.execute()
+
+    assert requested.get_property("movable_position") == Vector(3, 0)
+    assert idle.get_property("movable_position") == Vector(0, 0)
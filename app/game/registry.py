@@ -0,0 +1,178 @@
+from collections.abc import Hashable, Iterator, MutableMapping
+from collections.abc import Set as AbstractSet
+from typing import override
+
+import numpy as np
+import numpy.typing as npt
+
+from app.game.uobject import UObject
+from app.game.world import World, WorldObject
+
+# Вид объекта, по живым объектам которого определяется победитель
+SHIP_KIND = "ship"
+
+_EMPTY: frozenset[int] = frozenset()
+
+
+class ObjectRegistry(MutableMapping[int, UObject]):
+    """
+    Объекты игры (Game.items): id объекта -> объект.
+    Кроме самих объектов хранит вторичные индексы по свойствам fleet и kind
+    и по признаку disabled, поэтому выборка объектов флота или вида
+    и проверка победы не перебирают все объекты.
+    Индексы обновляются при добавлении и удалении объекта, а для объектов World -
+    и при любой записи fleet, kind или disabled (в том числе из систем).
+    Объекты другого типа после изменения этих свойств нужно переиндексировать (reindex).
+    """
+
+    def __init__(self, world: World) -> None:
+        self._world = world
+        self._items: dict[int, UObject] = {}
+        # id объекта -> (fleet, kind, disabled), по которым он сейчас проиндексирован
+        self._keys: dict[int, tuple[Hashable, Hashable, bool]] = {}
+        self._by_fleet: dict[Hashable, set[int]] = {}
+        self._by_kind: dict[Hashable, set[int]] = {}
+        self._disabled: set[int] = set()
+        # Не отключенные объекты: (fleet, kind) -> id объектов
+        self._alive: dict[tuple[Hashable, Hashable], set[int]] = {}
+        # Флоты, у которых есть не отключенные объекты: kind -> fleet
+        self._alive_fleets: dict[Hashable, set[Hashable]] = {}
+
+        world.observe(("fleet", "kind", "disabled"), self._on_changed)
+
+    @override
+    def __getitem__(self, object_id: int) -> UObject:
+        return self._items[object_id]
+
+    @override
+    def __setitem__(self, object_id: int, uobj: UObject) -> None:
+        """
+        Добавляет объект в игру. Если под этим id был другой объект World,
+        его строка освобождается.
+        """
+        old = self._items.get(object_id)
+        if old is not None:
+            self._unindex(object_id)
+        if isinstance(old, WorldObject) and not (
+            isinstance(uobj, WorldObject) and uobj.index == old.index
+        ):
+            self._world.remove(old.index)
+        self._items[object_id] = uobj
+        self._index(object_id, uobj)
+
+    @override
+    def __delitem__(self, object_id: int) -> None:
+        """
+        Удаляет объект из игры. Строка объекта World освобождается.
+        """
+        uobj = self._items.pop(object_id)
+        self._unindex(object_id)
+        if isinstance(uobj, WorldObject):
+            self._world.remove(uobj.index)
+
+    @override
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._items)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def fleet(self, fleet: Hashable) -> AbstractSet[int]:
+        """
+        id объектов флота
+        """
+        return self._by_fleet.get(fleet, _EMPTY)
+
+    def kind(self, kind: Hashable) -> AbstractSet[int]:
+        """
+        id объектов вида kind
+        """
+        return self._by_kind.get(kind, _EMPTY)
+
+    def disabled(self) -> AbstractSet[int]:
+        """
+        id отключенных объектов
+        """
+        return self._disabled
+
+    def alive(self, fleet: Hashable, kind: Hashable = SHIP_KIND) -> AbstractSet[int]:
+        """
+        id не отключенных объектов вида kind во флоте
+        """
+        return self._alive.get((fleet, kind), _EMPTY)
+
+    def alive_fleets(self, kind: Hashable = SHIP_KIND) -> AbstractSet[Hashable]:
+        """
+        Флоты, у которых остался хотя бы один не отключенный объект вида kind
+        """
+        return self._alive_fleets.get(kind, _EMPTY)
+
+    def winner(self, kind: Hashable = SHIP_KIND) -> Hashable | None:
+        """
+        Единственный флот, у которого остались не отключенные корабли, иначе None
+        """
+        fleets = self.alive_fleets(kind)
+        if len(fleets) != 1:
+            return None
+        return next(iter(fleets))
+
+    def reindex(self, object_id: int) -> None:
+        """
+        Перечитывает fleet, kind и disabled объекта
+        """
+        self._unindex(object_id)
+        self._index(object_id, self._items[object_id])
+
+    def _on_changed(self, rows: npt.NDArray[np.intp]) -> None:
+        world = self._world
+        for row, object_id in zip(rows.tolist(), world.object_ids[rows].tolist(), strict=True):
+            uobj = self._items.get(object_id)
+            # Строка могла быть освобождена или принадлежать объекту не из реестра
+            if isinstance(uobj, WorldObject) and uobj.index == row and world.used[row]:
+                self.reindex(object_id)
+
+    def _index(self, object_id: int, uobj: UObject) -> None:
+        fleet = _get(uobj, "fleet", None)
+        kind = _get(uobj, "kind", None)
+        disabled = bool(_get(uobj, "disabled", default=False))
+        self._keys[object_id] = (fleet, kind, disabled)
+
+        self._by_fleet.setdefault(fleet, set()).add(object_id)
+        self._by_kind.setdefault(kind, set()).add(object_id)
+        if disabled:
+            self._disabled.add(object_id)
+            return
+        self._alive.setdefault((fleet, kind), set()).add(object_id)
+        self._alive_fleets.setdefault(kind, set()).add(fleet)
+
+    def _unindex(self, object_id: int) -> None:
+        fleet, kind, disabled = self._keys.pop(object_id)
+
+        _discard(self._by_fleet, fleet, object_id)
+        _discard(self._by_kind, kind, object_id)
+        if disabled:
+            self._disabled.discard(object_id)
+            return
+        if not _discard(self._alive, (fleet, kind), object_id):
+            _discard(self._alive_fleets, kind, fleet)
+
+
+def _get(uobj: UObject, prop: str, default: object) -> object:
+    try:
+        return uobj.get_property(prop)
+    except KeyError:
+        return default
+
+
+def _discard[K, V](index: dict[K, set[V]], key: K, value: V) -> bool:
+    """
+    Удаляет value из index[key], пустое множество удаляется целиком.
+    Возвращает, остались ли значения по ключу.
+    """
+    values = index[key]
+    values.discard(value)
+    if values:
+        return True
+    del index[key]
+    return False
@@ -1,33 +1,28 @@
-import importlib
-import pkgutil
 from abc import ABCMeta
+from pathlib import Path
 
-from app.autogenerated import adapters
 from app.core.command import ICommand
 from app.core.ioc import IoC
 from app.game.uobject import UObject
+from codegen.adapter import build_adapter
 
 
-def ioc_setup_adapters() -> None:
-    adapter_dict = _compile_adapter_dict()
+def ioc_setup_adapters(cache_dir: Path | None = None) -> None:
+    """
+    Адаптеры собираются в памяти при первом запросе адаптера к интерфейсу.
+    cache_dir - каталог, где сохраняется скомпилированный код адаптеров между запусками.
+    """
 
     def make_adapter(interface: ABCMeta, uobj: UObject) -> object:
-        return adapter_dict[interface](uobj)
+        # Повторные команды к тому же объекту получают тот же адаптер
+        cache = uobj.get_adapters()
+        if cache is not None and (adapter := cache.get(interface)) is not None:
+            return adapter
+        if cache is None:
+            return build_adapter(interface, cache_dir=cache_dir)(uobj)
+        # Адаптер из кеша не должен удерживать объект, который хранит кеш
+        adapter = build_adapter(interface, cache_dir=cache_dir)(uobj.get_adapter_target())
+        cache[interface] = adapter
+        return adapter
 
     IoC[ICommand].resolve("IoC.Scope.Register", "Adapter", make_adapter).execute()
-
-
-def _compile_adapter_dict() -> dict[ABCMeta, type]:
-    """
-    Creates dict[InterfaceType, AdapterType]
-    Dynamically looks for adapters in all submodules of app.autogenerated.adapters
-    """
-    adapter_dict: dict[ABCMeta, type] = {}
-    for module_info in pkgutil.iter_modules(adapters.__path__):
-        module = importlib.import_module("." + module_info.name, adapters.__package__)
-        adapter: type = next(
-            type_ for name, type_ in module.__dict__.items() if name.endswith("Adapter")
-        )
-        interface = adapter.__bases__[0]
-        adapter_dict[interface] = adapter
-    return adapter_dict
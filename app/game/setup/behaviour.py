@@ -1,118 +1,106 @@
-from app.core.command import ICommand, LambdaCommand
-from app.core.ioc import IoC
-from app.game.uobject import UObject
+import math
+from functools import lru_cache
+
+from app.core.command import ICommand, MacroCommand
+from app.core.ioc import IoC, Resolver
+from app.game.behaviour.collision import HitDetectionCommand
+from app.game.behaviour.systems import (
+    AdjustVelocityToRotationSystemCommand,
+    BurnFuelSystemCommand,
+    MoveSystemCommand,
+    RotateSystemCommand,
+)
+from app.game.spatial import SpatialGrid
+from app.game.uobject import DerivedProperty, PropertyGetter, PropertySetter, UObject
 from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+POLAR_CACHE_SIZE = 1024
 
 
 def ioc_setup_iconsumesfuel() -> None:
-    def _get_amount(uobj: UObject) -> int:
-        return uobj.get_property("fuel_amount")
+    register = IoC[Resolver[ICommand]].resolve("IoC.Resolver", "IoC.Scope.Register")
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IConsumesFuel.amount.Get",
-        _get_amount,
-    ).execute()
+    register("IConsumesFuel.amount.Get", PropertyGetter("fuel_amount")).execute()
+    register("IConsumesFuel.amount.Set", PropertySetter("fuel_amount")).execute()
+    register("IConsumesFuel.consumption.Get", PropertyGetter("fuel_consumption")).execute()
 
-    def _set_amount(uobj: UObject, fuel_amount: int) -> None:
-        uobj.set_property("fuel_amount", fuel_amount)
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IConsumesFuel.amount.Set",
-        LambdaCommand(_set_amount).setup,
-    ).execute()
+def _compute_velocity(uobj: UObject) -> Vector:
+    angle: Angle = uobj.get_property("movable_angle")
+    velocity: int = uobj.get_property("movable_abs_velocity")
+    return Vector.from_angle_and_length(angle, velocity)
 
-    def _get_consumption(uobj: UObject) -> int:
-        return uobj.get_property("fuel_consumption")
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IConsumesFuel.consumption.Get",
-        _get_consumption,
-    ).execute()
+# Скорость пересчитывается только после изменения угла или модуля скорости
+VELOCITY = DerivedProperty(
+    name="velocity",
+    sources=("movable_angle", "movable_abs_velocity"),
+    compute=_compute_velocity,
+)
 
 
 def ioc_setup_imovable() -> None:
-    def _get_position(uobj: UObject) -> Vector:
-        return uobj.get_property("movable_position")
+    register = IoC[Resolver[ICommand]].resolve("IoC.Resolver", "IoC.Scope.Register")
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IMovable.position.Get",
-        _get_position,
-    ).execute()
+    register("IMovable.position.Get", PropertyGetter("movable_position")).execute()
+    register("IMovable.position.Set", PropertySetter("movable_position")).execute()
 
-    def _set_position(uobj: UObject, v: Vector) -> None:
-        uobj.set_property("movable_position", v)
+    def _get_velocity(uobj: UObject) -> Vector:
+        return uobj.get_derived(VELOCITY)
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IMovable.position.Set",
-        LambdaCommand(_set_position).setup,
-    ).execute()
+    register("IMovable.velocity.Get", _get_velocity).execute()
 
-    def _get_velocity(uobj: UObject) -> Vector:
-        angle: Angle = uobj.get_property("movable_angle")
-        velocity: int = uobj.get_property("movable_abs_velocity")
-        return Vector.from_angle_and_length(angle, velocity)
-
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IMovable.velocity.Get",
-        _get_velocity,
-    ).execute()
+
+@lru_cache(maxsize=POLAR_CACHE_SIZE)
+def _to_polar(x: int, y: int) -> tuple[Angle, float]:
+    """
+    Угол и модуль скорости. Сообщения move повторяют одни и те же скорости,
+    поэтому atan2 и hypot считаются один раз на каждый вектор.
+    """
+    return Angle.from_rads(math.atan2(y, x)), math.hypot(x, y)
 
 
 def ioc_setup_icanchangevelocity() -> None:
+    register = IoC[Resolver[ICommand]].resolve("IoC.Resolver", "IoC.Scope.Register")
+
     def _get_velocity(uobj: UObject) -> Vector:
-        angle: Angle = uobj.get_property("movable_angle")
-        velocity: int = uobj.get_property("movable_abs_velocity")
-        return Vector.from_angle_and_length(angle, velocity)
-
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "ICanChangeVelocity.velocity.Get",
-        _get_velocity,
-    ).execute()
+        return uobj.get_derived(VELOCITY)
+
+    register("ICanChangeVelocity.velocity.Get", _get_velocity).execute()
 
     def _set_velocity(uobj: UObject, v: Vector) -> None:
-        angle = v.get_angle()
-        length = v.get_length()
+        angle, length = _to_polar(v.x, v.y)
         uobj.set_property("movable_angle", angle)
         uobj.set_property("movable_abs_velocity", length)
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "ICanChangeVelocity.velocity.Set",
-        LambdaCommand(_set_velocity).setup,
-    ).execute()
+    register("ICanChangeVelocity.velocity.Set", _set_velocity).execute()
 
 
 def ioc_setup_irotatable() -> None:
-    def _get_angle(uobj: UObject) -> Angle:
-        return uobj.get_property("rotatable_angle")
+    register = IoC[Resolver[ICommand]].resolve("IoC.Resolver", "IoC.Scope.Register")
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IRotatable.angle.Get",
-        _get_angle,
+    register("IRotatable.angle.Get", PropertyGetter("rotatable_angle")).execute()
+    register("IRotatable.angle.Set", PropertySetter("rotatable_angle")).execute()
+    register(
+        "IRotatable.angular_velocity.Get", PropertyGetter("rotatable_angular_velocity")
     ).execute()
 
-    def _set_angle(uobj: UObject, a: Angle) -> None:
-        uobj.set_property("rotatable_angle", a)
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IRotatable.angle.Set",
-        LambdaCommand(_set_angle).setup,
-    ).execute()
+def ioc_setup_systems() -> None:
+    register = IoC[Resolver[ICommand]].resolve("IoC.Resolver", "IoC.Scope.Register")
 
-    def _get_angular_velocity(uobj: UObject) -> Angle:
-        return uobj.get_property("rotatable_angular_velocity")
+    def _get_systems(world: World) -> ICommand:
+        # Порядок как у покомандного хода: поворот, скорость по углу, движение, расход топлива.
+        # Попадания проверяются по отрезкам, пройденным за квант.
+        return MacroCommand(
+            [
+                RotateSystemCommand(world),
+                AdjustVelocityToRotationSystemCommand(world),
+                MoveSystemCommand(world),
+                BurnFuelSystemCommand(world),
+                HitDetectionCommand(world, SpatialGrid(world)),
+            ]
+        )
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "IRotatable.angular_velocity.Get",
-        _get_angular_velocity,
-    ).execute()
+    register("Game.Systems", _get_systems).execute()
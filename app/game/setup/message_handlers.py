@@ -1,52 +1,86 @@
+from collections.abc import Callable
+from dataclasses import dataclass
 from queue import Queue
 
 from loguru import logger
 
-from app.core.command import ICommand, LambdaCommand
+from app.core.command import ICommand
 from app.core.ioc import IoC
 from app.game.behaviour.movement import ICanChangeVelocity, IMovable, MoveCommand
+from app.game.behaviour.systems import MOVE
+from app.game.registry import ObjectRegistry
 from app.game.setup.behaviour import ioc_setup_icanchangevelocity, ioc_setup_imovable
-from app.game.uobject import UObject, UObjectImpl
 from app.game.value_types import Vector
+from app.game.world import World, WorldObject
 from app.server import Message
+from codegen.decoder import build_decoder
+
+
+@dataclass(frozen=True, slots=True)
+class CreateObjectArgs:
+    fleet: str | None = None
+    kind: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class MoveArgs:
+    x: int
+    y: int
+    velocity_x: int
+    velocity_y: int
 
 
 def ioc_setup_move() -> None:
     ioc_setup_imovable()
     ioc_setup_icanchangevelocity()
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "MessageHandler.create_object",
-        LambdaCommand(_handle_create_object).setup,
-    ).execute()
+    _register_message_handler("create_object", _handle_create_object)
+    _register_message_handler("move", _handle_move)
+
 
-    IoC[ICommand].resolve(
-        "IoC.Scope.Register",
-        "MessageHandler.move",
-        LambdaCommand(_handle_move).setup,
-    ).execute()
+def _register_message_handler(op_id: str, handler: Callable[..., None]) -> None:
+    """
+    Регистрирует обработчик операции и, если обработчик принимает аргументы, их декодер
+    """
+    IoC[ICommand].resolve("IoC.Scope.Register", f"MessageHandler.{op_id}", handler).execute()
+    decoder = build_decoder(handler)
+    if decoder is not None:
+        IoC[ICommand].resolve("IoC.Scope.Register", f"MessageDecoder.{op_id}", decoder).execute()
 
 
-def _handle_create_object(message: Message) -> None:
+def _handle_create_object(message: Message, args: CreateObjectArgs) -> None:
+    """
+    Создает объект. Флот (fleet) и вид (kind) объекта, если заданы, попадают в индексы Game.items.
+    """
     logger.info("Handling 'create_object'")
-    items = IoC[dict[int, UObject]].resolve("Game.items")
+    items = IoC[ObjectRegistry].resolve("Game.items")
+    world = IoC[World].resolve("Game.world")
 
-    items[message.object_id] = UObjectImpl()
+    obj = world.create(message.object_id)
+    if args.fleet is not None:
+        obj.set_property("fleet", args.fleet)
+    if args.kind is not None:
+        obj.set_property("kind", args.kind)
+    items[message.object_id] = obj
 
 
-def _handle_move(message: Message) -> None:
+def _handle_move(message: Message, args: MoveArgs) -> None:
+    """
+    Задает положение и скорость объекта и сдвигает его на один шаг:
+    объект World - через MoveSystemCommand в ближайший квант, остальные - командой в очереди игры
+    """
     logger.info("Handling 'move'")
-    items = IoC[dict[int, UObject]].resolve("Game.items")
-    queue = IoC[Queue[ICommand]].resolve("Game.Queue")
+    items = IoC[ObjectRegistry].resolve("Game.items")
 
     obj = items[message.object_id]
 
     can_change_velocity = IoC[ICanChangeVelocity].resolve("Adapter", ICanChangeVelocity, obj)
     movable = IoC[IMovable].resolve("Adapter", IMovable, obj)
 
-    args = message.args
-    movable.set_position(Vector(args["x"], args["y"]))
-    can_change_velocity.set_velocity(Vector(args["velocity_x"], args["velocity_y"]))
+    movable.set_position(Vector(args.x, args.y))
+    can_change_velocity.set_velocity(Vector(args.velocity_x, args.velocity_y))
 
-    queue.put(MoveCommand(movable))
+    if isinstance(obj, WorldObject):
+        IoC[World].resolve("Game.world").request([obj.index], MOVE)
+    else:
+        IoC[Queue[ICommand]].resolve("Game.Queue").put(MoveCommand(movable))
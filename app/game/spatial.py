@@ -0,0 +1,167 @@
+import itertools
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from app.game.world import World, written
+
+IntArray = npt.NDArray[np.int64]
+
+DEFAULT_CELL_SIZE = 64
+
+
+class SpatialGrid:
+    """
+    Равномерная сетка по movable_position объектов World, у которых есть collision_radius.
+    Обновляется инкрементально: World сообщает об изменении позиций (и при записи
+    через IMovable.position.Set, и из MoveSystemCommand), а сетка перекладывает
+    только объекты, сменившие ячейку.
+    Для всех движущихся объектов сетка помнит позицию на момент прошлой проверки
+    попаданий (start), чтобы проверять весь отрезок движения за квант.
+    Запись позиции через set_property - это перестановка объекта, а не движение:
+    отрезок начинается заново с новой позиции.
+    """
+
+    def __init__(self, world: World, cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        self._world = world
+        self._cell_size = cell_size
+
+        self._cells: defaultdict[tuple[int, int], set[int]] = defaultdict(set)
+        self._indexed = np.zeros(0, dtype=np.bool_)
+        self._cell = np.zeros((0, 2), dtype=np.int64)
+        self.start = np.zeros((0, 2), dtype=np.int64)
+        # Наибольший радиус среди целей: на столько расширяется область поиска
+        self._max_radius = 0.0
+
+        world.observe(("movable_position", "collision_radius"), self._on_changed)
+        world.observe((written("movable_position"),), self._on_placed)
+        self._on_changed(np.arange(world.capacity, dtype=np.intp))
+        self.reset_start()
+
+    def query(self, a: IntArray, b: IntArray) -> set[int]:
+        """
+        Индексы целей в ячейках, через которые проходит отрезок a-b,
+        и в соседних с ними на наибольший радиус цели
+        """
+        size = self._cell_size
+        (a_x, a_y), (b_x, b_y) = (a // size).tolist(), (b // size).tolist()
+        keys: Iterable[tuple[int, int]]
+        if abs(a_x - b_x) <= 1 or abs(a_y - b_y) <= 1:
+            # Отрезок в полосе шириной в две ячейки: прямоугольник вокруг него почти не больше
+            # пройденных ячеек, а перебирается быстрее
+            radius = math.ceil(self._max_radius)
+            low_x, low_y = ((np.minimum(a, b) - radius) // size).tolist()
+            high_x, high_y = ((np.maximum(a, b) + radius) // size).tolist()
+            keys = itertools.product(range(low_x, high_x + 1), range(low_y, high_y + 1))
+        else:
+            margin = math.ceil(self._max_radius / size)
+            keys = {
+                (x, y)
+                for cell_x, cell_y in self._traverse(a, b)
+                for x in range(cell_x - margin, cell_x + margin + 1)
+                for y in range(cell_y - margin, cell_y + margin + 1)
+            }
+
+        found: set[int] = set()
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell:
+                found |= cell
+        return found
+
+    def _traverse(self, a: IntArray, b: IntArray) -> Iterator[tuple[int, int]]:
+        """
+        Ячейки, через которые проходит отрезок a-b (алгоритм Amanatides-Woo).
+        Если отрезок проходит точно через угол ячейки, возвращаются обе соседние с углом ячейки.
+        """
+        size = self._cell_size
+        (x0, y0), (x1, y1) = a.tolist(), b.tolist()
+        cell_x, cell_y = x0 // size, y0 // size
+        end_x, end_y = x1 // size, y1 // size
+        step_x, t_x, delta_x = _axis(x0, x1, cell_x, size)
+        step_y, t_y, delta_y = _axis(y0, y1, cell_y, size)
+
+        yield cell_x, cell_y
+        while (cell_x, cell_y) != (end_x, end_y):
+            # Доля отрезка до следующей границы ячейки; по дошедшей до конца оси шагов нет
+            next_x = t_x if cell_x != end_x else math.inf
+            next_y = t_y if cell_y != end_y else math.inf
+            if next_x == next_y:
+                yield cell_x + step_x, cell_y
+                yield cell_x, cell_y + step_y
+            if next_x <= next_y:
+                cell_x += step_x
+                t_x += delta_x
+            if next_y <= next_x:
+                cell_y += step_y
+                t_y += delta_y
+            yield cell_x, cell_y
+
+    def reset_start(self) -> None:
+        """
+        Начало следующего отрезка движения - текущие позиции
+        """
+        self._resize()
+        self.start[:] = self._world.position
+
+    def _on_placed(self, rows: npt.NDArray[np.intp]) -> None:
+        self._resize()
+        self.start[rows] = self._world.position[rows]
+
+    def _on_changed(self, rows: npt.NDArray[np.intp]) -> None:
+        self._resize()
+        world = self._world
+        position = world.position[rows]
+
+        indexable = world.mask("movable_position", "collision_radius")[rows]
+        cells = position // self._cell_size
+        indexed = self._indexed[rows]
+        moved = indexed & indexable & (cells != self._cell[rows]).any(axis=1)
+
+        for row in rows[indexed & (~indexable | moved)].tolist():
+            self._remove(row)
+        for row, cell in zip(
+            rows[indexable & (~indexed | moved)].tolist(),
+            cells[indexable & (~indexed | moved)].tolist(),
+            strict=True,
+        ):
+            self._cells[tuple(cell)].add(row)
+            self._cell[row] = cell
+            self._indexed[row] = True
+
+        if indexable.any():
+            self._max_radius = max(self._max_radius, world.collision_radius[rows[indexable]].max())
+
+    def _remove(self, row: int) -> None:
+        key = tuple(self._cell[row].tolist())
+        cell = self._cells[key]
+        cell.discard(row)
+        if not cell:
+            del self._cells[key]
+        self._indexed[row] = False
+
+    def _resize(self) -> None:
+        capacity = self._world.capacity
+        if len(self._indexed) == capacity:
+            return
+        for name in ("_indexed", "_cell", "start"):
+            old: npt.NDArray[Any] = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+
+def _axis(start: int, end: int, cell: int, size: int) -> tuple[int, float, float]:
+    """
+    Обход ячеек по одной оси: направление шага, доля отрезка до первой границы ячейки
+    и доля отрезка на одну ячейку
+    """
+    if start == end:
+        return 0, math.inf, math.inf
+    step = 1 if end > start else -1
+    boundary = (cell + 1) * size if step > 0 else cell * size
+    return step, (boundary - start) / (end - start), size / abs(end - start)
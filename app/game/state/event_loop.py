@@ -1,5 +1,8 @@
+import threading
+import time
+from collections import deque
 from collections.abc import Callable
-from queue import Queue
+from datetime import UTC, datetime, timedelta
 from threading import Thread
 from typing import Any, override
 
@@ -8,22 +11,62 @@ from loguru import logger
 from app.core.command import ICommand
 from app.core.exception_handler_store import ExceptionHandlerStore
 from app.core.ioc import IoC
+from app.game.state.scheduler import Scheduler, TimerHandle
 
 HookFunc = Callable[[], None]
 
+# Вес нового замера в экспоненциально сглаженном отставании таймеров
+LAG_SMOOTHING = 0.2
+
 
 class EventLoop:
+    """
+    Однопоточный ивент луп с очередью команд и отложенными командами.
+    Команды забираются пачками: за один захват блокировки луп берет все наступившие
+    отложенные и все пришедшие команды, а затем выполняет их по одной.
+    """
+
     def __init__(
         self,
         exception_handler_store: ExceptionHandlerStore,
     ) -> None:
-        self._command_queue: Queue[ICommand] = Queue()
+        # Очередь команд и планировщик защищены одним условием
+        self._commands: deque[ICommand] = deque()
+        self._scheduler = Scheduler()
+        self._condition = threading.Condition()
+        self._thread_id: int | None = None
+
         self._exception_handler_store = exception_handler_store
 
         self._before_hooks: list[HookFunc] = []
         self._after_hooks: list[HookFunc] = []
 
-        self._stop_func: Callable[[], bool] = lambda: False
+        self._hard_stop = False
+        self._soft_stop = False
+
+        self._last_batch_time: float = 0.0
+        self._lag: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Число ожидающих выполнения команд (без отложенных)
+        """
+        return len(self._commands)
+
+    @property
+    def last_batch_time(self) -> float:
+        """
+        Время выполнения последней пачки команд в секундах
+        """
+        return self._last_batch_time
+
+    @property
+    def lag(self) -> float:
+        """
+        Сглаженное опоздание выполнения отложенных команд в секундах
+        """
+        return self._lag
 
     def add_before_hook(self, hook: HookFunc) -> None:
         self._before_hooks.append(hook)
@@ -32,36 +75,152 @@ class EventLoop:
         self._after_hooks.append(hook)
 
     def put_command(self, cmd: ICommand) -> None:
-        self._command_queue.put(cmd)
+        with self._condition:
+            self._commands.append(cmd)
+            self._condition.notify()
+
+    def schedule_after(
+        self, cmd: ICommand, delay: timedelta, *, keep_alive: bool = True
+    ) -> TimerHandle:
+        """
+        Выполнить команду не раньше, чем через delay.
+        Мягкая остановка ждет только команд с keep_alive: повторяющиеся команды
+        планируются без него, иначе луп с ними никогда бы не остановился.
+        """
+        return self._schedule(cmd, time.monotonic() + delay.total_seconds(), keep_alive=keep_alive)
+
+    def schedule_at(self, cmd: ICommand, at: datetime, *, keep_alive: bool = True) -> TimerHandle:
+        """
+        Выполнить команду не раньше момента at
+        """
+        return self.schedule_after(cmd, at - datetime.now(UTC), keep_alive=keep_alive)
+
+    def _schedule(self, cmd: ICommand, due: float, *, keep_alive: bool) -> TimerHandle:
+        with self._condition:
+            next_due = self._scheduler.next_due()
+            handle = self._scheduler.schedule(cmd, due, keep_alive=keep_alive)
+            # Поток ивент лупа может спать до прежнего ближайшего таймера - будим его
+            if threading.get_ident() != self._thread_id and (next_due is None or due < next_due):
+                self._condition.notify()
+        return handle
 
     def run_forever(self) -> None:
         self._run()
 
     def run_until_complete(self) -> None:
-        self._stop_func = lambda: self._command_queue.empty()
+        self._soft_stop = True
         self._run()
 
     def set_hard_stop(self) -> None:
-        self._stop_func = lambda: True
+        with self._condition:
+            self._hard_stop = True
+            self._condition.notify()
 
     def set_soft_stop(self) -> None:
-        self._stop_func = lambda: self._command_queue.empty()
+        with self._condition:
+            self._soft_stop = True
+            self._condition.notify()
+
+    def _should_stop(self) -> bool:
+        """
+        Вызывается с захваченным self._condition
+        """
+        return self._hard_stop or (
+            self._soft_stop and not self._commands and not self._scheduler.keeps_alive()
+        )
 
     def _run(self) -> None:
         logger.info("Starting event loop")
+        self._thread_id = threading.get_ident()
         for hook in self._before_hooks:
             hook()
 
-        while not self._stop_func():
-            cmd = self._command_queue.get()
+        while batch := self._take_batch():
+            self._execute_batch(batch)
+
+        for hook in self._after_hooks:
+            hook()
+        self._thread_id = None
+        logger.info("Done with event loop")
+
+    def _take_batch(self) -> list[ICommand]:
+        """
+        Забирает все наступившие отложенные и все пришедшие команды.
+        Если их нет - ждет, но не дольше, чем до ближайшей отложенной.
+        Пустой список означает, что луп нужно остановить.
+        """
+        with self._condition:
+            while not self._should_stop():
+                now = time.monotonic()
+                batch: list[ICommand] = []
+                while handle := self._scheduler.pop_due(now):
+                    batch.append(handle.cmd)
+                    self._lag += (now - handle.due - self._lag) * LAG_SMOOTHING
+                if self._commands:
+                    batch.extend(self._commands)
+                    self._commands.clear()
+                if batch:
+                    return batch
+
+                next_due = self._scheduler.next_due()
+                self._condition.wait(None if next_due is None else next_due - now)
+        return []
+
+    def _execute_batch(self, batch: list[ICommand]) -> None:
+        start = time.perf_counter()
+        for i, cmd in enumerate(batch):
             try:
                 cmd.execute()
             except Exception as exc:
                 self._exception_handler_store.create_handler_command(cmd, exc).execute()
 
-        for hook in self._after_hooks:
-            hook()
-        logger.info("Done with event loop")
+            if self._hard_stop:
+                # Невыполненные команды пачки возвращаем в начало очереди
+                with self._condition:
+                    self._commands.extendleft(reversed(batch[i + 1 :]))
+                break
+        self._last_batch_time = time.perf_counter() - start
+
+
+class RepeatCommand(ICommand):
+    """
+    Выполняет команду с фиксированным периодом в текущем ивент лупе.
+    Следующее выполнение планируется от времени предыдущего, а не от его окончания,
+    поэтому период не накапливает задержку выполнения самой команды.
+    """
+
+    def __init__(self, cmd: ICommand, period: timedelta) -> None:
+        self._cmd = cmd
+        self._period = period.total_seconds()
+
+        self._due: float | None = None
+        self._handle: TimerHandle | None = None
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        if self._handle:
+            self._handle.cancel()
+
+    @override
+    def execute(self) -> None:
+        if self._cancelled:
+            return
+        try:
+            self._cmd.execute()
+        finally:
+            if not self._cancelled:
+                self._schedule_next()
+
+    def _schedule_next(self) -> None:
+        now = time.monotonic()
+        due = now if self._due is None else self._due
+        # Если отстали больше чем на период, пропущенные выполнения не наверстываем
+        self._due = max(due + self._period, now)
+        event_loop = IoC[EventLoop].resolve("EventLoop")
+        self._handle = event_loop.schedule_after(
+            self, timedelta(seconds=self._due - now), keep_alive=False
+        )
 
 
 class RunEventLoopInThreadCommand(ICommand):
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from loguru import logger
 
 from app.core.command import ICommand
@@ -6,12 +8,21 @@ from app.game.state.event_loop import EventLoop
 
 
 class DelayedCommand(ICommand):
-    def __init__(self, cmd: ICommand) -> None:
+    """
+    Откладывает команду: ставит в конец очереди ивент лупа,
+    а если задан delay - планирует не раньше, чем через delay
+    """
+
+    def __init__(self, cmd: ICommand, delay: timedelta | None = None) -> None:
         self._cmd = cmd
+        self._delay = delay
 
     def execute(self) -> None:
         event_loop = IoC[EventLoop].resolve("EventLoop")
-        return event_loop.put_command(self._cmd)
+        if self._delay is None:
+            event_loop.put_command(self._cmd)
+        else:
+            event_loop.schedule_after(self._cmd, self._delay)
 
 
 class InjectableCommand(ICommand):
@@ -6,31 +6,65 @@ from typing import Any, override
 from loguru import logger
 
 from app.core.command import ICommand
+from app.core.exception_handler_store import ExceptionHandlerStore
 from app.core.ioc import IoC
 
 
 class GameCommand(ICommand):
-    def __init__(
+    """
+    Один квант игры.
+    В блокирующем режиме весь квант ждет и выполняет команды из очереди игры.
+    В неблокирующем режиме выполняет только уже лежащие в очереди команды
+    (не больше budget) и сразу возвращает управление ивент лупу,
+    а следующий квант планируется по времени снаружи (см. RepeatCommand).
+    Исключение команды передается обработчику исключений и не прерывает квант,
+    systems выполняется один раз в конце каждого кванта.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         id_: int,
         queue: Queue[ICommand],
         quant: timedelta,
         scope: Any,
         init: Callable[[], None],
+        *,
+        blocking: bool = True,
+        budget: int | None = None,
+        systems: ICommand | None = None,
     ) -> None:
         self._id = id_
         self._queue = queue
         self._quant = quant
         self._scope = scope
+        self._blocking = blocking
+        self._budget = budget
+        self._systems = systems
 
+        previous_scope = IoC.resolve("IoC.Scope.Current")
         IoC[ICommand].resolve("IoC.Scope.Current.Set", self._scope).execute()
         init()
+        IoC[ICommand].resolve("IoC.Scope.Current.Set", previous_scope).execute()
 
     @override
     def execute(self) -> None:
         logger.debug(f"Starting tick for game {self._id}")
+        previous_scope = IoC.resolve("IoC.Scope.Current")
         IoC[ICommand].resolve("IoC.Scope.Current.Set", self._scope).execute()
 
+        try:
+            if self._blocking:
+                self._run_blocking()
+            else:
+                self._run_cooperative()
+            if self._systems:
+                self._systems.execute()
+        finally:
+            IoC[ICommand].resolve("IoC.Scope.Current.Set", previous_scope).execute()
+
+        logger.debug(f"Done with tick for game {self._id}")
+
+    def _run_blocking(self) -> None:
         start = datetime.now(UTC)
         while datetime.now(UTC) - start < self._quant:
             try:
@@ -38,6 +72,25 @@ class GameCommand(ICommand):
             except Empty:
                 pass
             else:
-                cmd.execute()
+                self._execute(cmd)
 
-        logger.debug(f"Done with tick for game {self._id}")
+    def _run_cooperative(self) -> None:
+        # Команды, пришедшие во время кванта, останутся до следующего
+        count = self._queue.qsize()
+        if self._budget is not None:
+            count = min(count, self._budget)
+
+        for _ in range(count):
+            try:
+                cmd = self._queue.get_nowait()
+            except Empty:
+                break
+            self._execute(cmd)
+
+    @staticmethod
+    def _execute(cmd: ICommand) -> None:
+        try:
+            cmd.execute()
+        except Exception as exc:
+            store = IoC[ExceptionHandlerStore].resolve("ExceptionHandlerStore")
+            store.create_handler_command(cmd, exc).execute()
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+
+from app.core.command import ICommand
+
+
+class TimerHandle:
+    """
+    Запланированная команда. Отмена ленивая: запись остается в куче,
+    но будет пропущена при извлечении.
+    keep_alive - не дает мягко остановленному ивент лупу завершиться, пока команда не выполнена.
+    """
+
+    __slots__ = ("_cancelled", "cmd", "due", "keep_alive")
+
+    def __init__(self, due: float, cmd: ICommand, *, keep_alive: bool = True) -> None:
+        self.due = due
+        self.cmd = cmd
+        self.keep_alive = keep_alive
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def __repr__(self) -> str:
+        return f"TimerHandle(due={self.due:.3f}, cmd={self.cmd}, cancelled={self._cancelled})"
+
+
+class Scheduler:
+    """
+    Куча отложенных команд, время - по time.monotonic.
+    Не потокобезопасен, синхронизация на стороне владельца (EventLoop).
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+
+    def schedule(self, cmd: ICommand, due: float, *, keep_alive: bool = True) -> TimerHandle:
+        handle = TimerHandle(due, cmd, keep_alive=keep_alive)
+        heapq.heappush(self._heap, (due, next(self._counter), handle))
+        return handle
+
+    def next_due(self) -> float | None:
+        """
+        Время ближайшей неотмененной команды
+        """
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> TimerHandle | None:
+        """
+        Извлекает ближайшую команду, если ее время наступило
+        """
+        self._drop_cancelled()
+        if not self._heap or self._heap[0][0] > now:
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def keeps_alive(self) -> bool:
+        """
+        Есть ли неотмененные команды с keep_alive
+        """
+        return any(handle.keep_alive and not handle.cancelled for _, _, handle in self._heap)
+
+    def __len__(self) -> int:
+        self._drop_cancelled()
+        return len(self._heap)
+
+    def _drop_cancelled(self) -> None:
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
@@ -1,5 +1,7 @@
 import threading
+import time
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from typing import Any
 from unittest.mock import Mock
 
@@ -12,6 +14,7 @@ from app.game.setup.state import ioc_setup_event_loop, ioc_setup_exception_handl
 from app.game.state.event_loop import (
     EventLoop,
     HardStopEventLoopCommand,
+    RepeatCommand,
     RunEventLoopInThreadCommand,
     SoftStopEventLoopCommand,
 )
@@ -108,3 +111,148 @@ def test_soft_stop(el_setup: EventLoopSetup) -> None:
     event.wait()
     cmd1.execute.assert_called_once()
     cmd2.execute.assert_called_once()
+
+
+def test_schedule_after(el_setup: EventLoopSetup) -> None:
+    event_loop = el_setup.event_loop
+    executed: list[str] = []
+
+    def make_cmd(name: str) -> Mock:
+        cmd = Mock()
+        cmd.execute = lambda: executed.append(name)
+        return cmd
+
+    event_loop.schedule_after(make_cmd("late"), timedelta(milliseconds=50))
+    event_loop.schedule_after(make_cmd("early"), timedelta(milliseconds=10))
+    event_loop.put_command(make_cmd("now"))
+
+    start = time.monotonic()
+    event_loop.run_until_complete()
+
+    assert executed == ["now", "early", "late"]
+    assert time.monotonic() - start >= 0.05
+
+
+def test_delayed_command_with_delay(el_setup: EventLoopSetup) -> None:
+    mock_cmd = Mock()
+    event = threading.Event()
+    mock_cmd.execute = event.set
+
+    el_setup.event_loop.put_command(DelayedCommand(mock_cmd, timedelta(milliseconds=10)))
+
+    RunEventLoopInThreadCommand(el_setup.event_loop, el_setup.scope).execute()
+    event.wait()
+
+    el_setup.event_loop.put_command(HardStopEventLoopCommand(el_setup.event_loop))
+
+
+def test_schedule_at_and_cancel(el_setup: EventLoopSetup) -> None:
+    event_loop = el_setup.event_loop
+    cancelled_cmd = Mock()
+    cmd = Mock()
+
+    handle = event_loop.schedule_after(cancelled_cmd, timedelta(milliseconds=10))
+    event_loop.schedule_at(cmd, datetime.now(UTC) + timedelta(milliseconds=20))
+    handle.cancel()
+
+    event_loop.run_until_complete()
+
+    cancelled_cmd.execute.assert_not_called()
+    cmd.execute.assert_called_once()
+
+
+def test_schedule_from_other_thread(el_setup: EventLoopSetup) -> None:
+    """
+    Таймер, запланированный из другого потока, должен разбудить спящий ивент луп
+    """
+    event_loop = el_setup.event_loop
+    RunEventLoopInThreadCommand(event_loop, el_setup.scope).execute()
+
+    event = threading.Event()
+    cmd = Mock()
+    cmd.execute = event.set
+
+    event_loop.schedule_after(Mock(), timedelta(hours=1))
+    time.sleep(0.01)
+    event_loop.schedule_after(cmd, timedelta(milliseconds=10))
+    assert event.wait(timeout=1)
+
+    event_loop.put_command(HardStopEventLoopCommand(event_loop))
+
+
+def test_soft_stop_with_repeat_command(el_setup: EventLoopSetup) -> None:
+    event_loop = el_setup.event_loop
+    stopped = threading.Event()
+    event_loop.add_after_hook(stopped.set)
+    RunEventLoopInThreadCommand(event_loop, el_setup.scope).execute()
+
+    # Кванты игры повторяются бесконечно, а отложенная команда - один раз
+    ticked = threading.Event()
+    tick = Mock()
+    tick.execute = ticked.set
+    event_loop.put_command(RepeatCommand(tick, timedelta(milliseconds=10)))
+    assert ticked.wait(timeout=1)
+
+    delayed = Mock()
+    event_loop.schedule_after(delayed, timedelta(milliseconds=50))
+    event_loop.put_command(SoftStopEventLoopCommand(event_loop))
+
+    # Луп дожидается отложенной команды, но не следующих квантов
+    assert stopped.wait(timeout=1)
+    delayed.execute.assert_called_once()
+
+
+def test_repeat_command(el_setup: EventLoopSetup) -> None:
+    event_loop = el_setup.event_loop
+    RunEventLoopInThreadCommand(event_loop, el_setup.scope).execute()
+
+    times: list[float] = []
+    done = threading.Event()
+
+    def tick() -> None:
+        times.append(time.monotonic())
+        if len(times) == 3:
+            repeat.cancel()
+            done.set()
+
+    cmd = Mock()
+    cmd.execute = tick
+    repeat = RepeatCommand(cmd, timedelta(milliseconds=20))
+    event_loop.put_command(repeat)
+
+    assert done.wait(timeout=1)
+    event_loop.put_command(HardStopEventLoopCommand(event_loop))
+
+    assert len(times) == 3
+    assert times[2] - times[0] >= 0.04
+
+
+def test_batch_exception_handling(
+    el_setup: EventLoopSetup, exception_handler_store: ExceptionHandlerStore
+) -> None:
+    """
+    Исключение одной команды из пачки обрабатывается отдельно,
+    остальные команды пачки выполняются
+    """
+    event_loop = el_setup.event_loop
+    handled: list[Exception] = []
+
+    def handler(_cmd: ICommand, exc: Exception) -> ICommand:
+        handled.append(exc)
+        return Mock()
+
+    exception_handler_store.register_default_handler(handler)
+
+    cmd1 = Mock()
+    failing_cmd = Mock()
+    failing_cmd.execute.side_effect = ValueError
+    cmd2 = Mock()
+    for cmd in (cmd1, failing_cmd, cmd2):
+        event_loop.put_command(cmd)
+
+    event_loop.run_until_complete()
+
+    cmd1.execute.assert_called_once()
+    cmd2.execute.assert_called_once()
+    assert len(handled) == 1
+    assert isinstance(handled[0], ValueError)
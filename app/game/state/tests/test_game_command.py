@@ -2,8 +2,11 @@ from datetime import timedelta
 from queue import Queue
 from unittest.mock import MagicMock
 
+from app.core.command import ICommand
+from app.core.exception_handler_store import ExceptionHandlerStore
 from app.core.ioc import IoC
 from app.core.ioc_scoped import Scope
+from app.game.setup.state import ioc_setup_exception_handler_store
 from app.game.state.game_command import GameCommand
 
 
@@ -21,3 +24,67 @@ def test_game_command() -> None:
     game_cmd.execute()
 
     cmd.execute.assert_called_once()
+
+
+def test_game_command_cooperative() -> None:
+    """
+    В неблокирующем режиме квант выполняет не больше budget уже лежащих
+    в очереди команд и возвращает текущий скоуп
+    """
+    queue = Queue()
+    commands = [MagicMock() for _ in range(3)]
+    for cmd in commands:
+        queue.put(cmd)
+
+    root_scope = IoC[Scope].resolve("IoC.Scope.Current")
+    scope = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    game_cmd = GameCommand(
+        1, queue, timedelta(seconds=10), scope, lambda: None, blocking=False, budget=2
+    )
+
+    game_cmd.execute()
+    commands[0].execute.assert_called_once()
+    commands[1].execute.assert_called_once()
+    commands[2].execute.assert_not_called()
+    assert IoC[Scope].resolve("IoC.Scope.Current") is root_scope
+
+    game_cmd.execute()
+    commands[2].execute.assert_called_once()
+
+    # Пустая очередь не блокирует
+    game_cmd.execute()
+
+
+def test_game_command_exception() -> None:
+    """
+    Исключение команды передается обработчику, остальные команды кванта
+    и systems все равно выполняются
+    """
+    ioc_setup_exception_handler_store()
+    handled: list[Exception] = []
+
+    def handler(_cmd: ICommand, exc: Exception) -> ICommand:
+        handled.append(exc)
+        return MagicMock()
+
+    store = IoC[ExceptionHandlerStore].resolve("ExceptionHandlerStore")
+    store.register_default_handler(handler)
+
+    queue = Queue()
+    failing_cmd = MagicMock()
+    failing_cmd.execute.side_effect = ValueError
+    cmd = MagicMock()
+    queue.put(failing_cmd)
+    queue.put(cmd)
+
+    systems = MagicMock()
+    scope = IoC[Scope].resolve("IoC.Scope.Create", "scope1")
+    game_cmd = GameCommand(
+        1, queue, timedelta(seconds=10), scope, lambda: None, blocking=False, systems=systems
+    )
+    game_cmd.execute()
+
+    cmd.execute.assert_called_once()
+    systems.execute.assert_called_once()
+    assert len(handled) == 1
+    assert isinstance(handled[0], ValueError)
@@ -0,0 +1,36 @@
+from app.game.state.scheduler import Scheduler
+from tests.mocks import MockCommand
+
+
+def test_scheduler_order() -> None:
+    scheduler = Scheduler()
+    cmd1, cmd2, cmd3 = MockCommand(), MockCommand(), MockCommand()
+    scheduler.schedule(cmd2, 2.0)
+    scheduler.schedule(cmd1, 1.0)
+    scheduler.schedule(cmd3, 2.0)
+
+    assert len(scheduler) == 3
+    assert scheduler.next_due() == 1.0
+    assert scheduler.pop_due(0.5) is None
+
+    handles = [scheduler.pop_due(5.0) for _ in range(3)]
+    # При равном времени сохраняется порядок планирования
+    assert [handle.cmd for handle in handles if handle] == [cmd1, cmd2, cmd3]
+    assert [handle.due for handle in handles if handle] == [1.0, 2.0, 2.0]
+    assert scheduler.pop_due(5.0) is None
+    assert scheduler.next_due() is None
+
+
+def test_scheduler_cancel() -> None:
+    scheduler = Scheduler()
+    cmd1, cmd2 = MockCommand(), MockCommand()
+    handle = scheduler.schedule(cmd1, 1.0)
+    scheduler.schedule(cmd2, 2.0)
+
+    handle.cancel()
+    assert handle.cancelled
+    assert scheduler.next_due() == 2.0
+    handle = scheduler.pop_due(5.0)
+    assert handle
+    assert handle.cmd is cmd2
+    assert not scheduler
@@ -0,0 +1,103 @@
+from app.game.behaviour.collision import HitDetectionCommand
+from app.game.behaviour.systems import MOVE, MoveSystemCommand
+from app.game.registry import ObjectRegistry
+from app.game.spatial import SpatialGrid
+from app.game.uobject import UObjectImpl
+from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+
+def _ship(world: World, items: ObjectRegistry, object_id: int, fleet: str) -> None:
+    ship = world.create(object_id)
+    ship.set_property("fleet", fleet)
+    ship.set_property("kind", "ship")
+    items[object_id] = ship
+
+
+def test_registry_indexes() -> None:
+    world = World()
+    items = ObjectRegistry(world)
+    _ship(world, items, 1, "red")
+    _ship(world, items, 2, "red")
+    _ship(world, items, 3, "blue")
+    torpedo = world.create(4)
+    torpedo.set_property("fleet", "red")
+    torpedo.set_property("kind", "torpedo")
+    items[4] = torpedo
+
+    assert items.fleet("red") == {1, 2, 4}
+    assert items.kind("ship") == {1, 2, 3}
+    assert items.alive("red") == {1, 2}
+    assert items.alive_fleets() == {"red", "blue"}
+    assert items.winner() is None
+
+    # Отключение через World попадает в индексы без явной переиндексации
+    items[3].set_property("disabled", value=True)
+    assert items.disabled() == {3}
+    assert items.alive("blue") == set()
+    assert items.winner() == "red"
+
+    del items[1]
+    assert 1 not in items
+    assert len(world) == 3
+    assert items.fleet("red") == {2, 4}
+
+    # Смена флота переносит объект между индексами
+    items[2].set_property("fleet", "blue")
+    assert items.alive_fleets() == {"blue"}
+    assert items.winner() == "blue"
+
+
+def test_registry_reindex_plain_object() -> None:
+    items = ObjectRegistry(World())
+    ship = UObjectImpl()
+    ship.set_property("fleet", "red")
+    ship.set_property("kind", "ship")
+    items[1] = ship
+    assert items.winner() == "red"
+
+    ship.set_property("disabled", value=True)
+    items.reindex(1)
+    assert items.winner() is None
+    assert items.disabled() == {1}
+
+
+def test_hit_updates_winner() -> None:
+    world = World()
+    items = ObjectRegistry(world)
+    _ship(world, items, 1, "red")
+    _ship(world, items, 2, "blue")
+    items[2].set_property("movable_position", Vector(100, 0))
+    items[2].set_property("collision_radius", 5)
+    grid = SpatialGrid(world)
+
+    torpedo = world.create(3)
+    torpedo.set_property("fleet", "red")
+    torpedo.set_property("kind", "torpedo")
+    torpedo.set_property("projectile", value=True)
+    torpedo.set_property("movable_position", Vector(0, 0))
+    torpedo.set_property("movable_angle", Angle(0))
+    torpedo.set_property("movable_abs_velocity", 200)
+    items[3] = torpedo
+
+    world.request([torpedo.index], MOVE)
+    MoveSystemCommand(world).execute()
+    HitDetectionCommand(world, grid).execute()
+    assert items.disabled() == {2, 3}
+    assert items.winner() == "red"
+
+
+def test_registry_replace_frees_row() -> None:
+    world = World()
+    items = ObjectRegistry(world)
+    _ship(world, items, 1, "red")
+    old = items[1]
+
+    # Тот же объект под тем же id: строка остается занятой
+    items[1] = old
+    assert len(world) == 1
+
+    _ship(world, items, 1, "blue")
+    assert len(world) == 1
+    assert items.fleet("red") == set()
+    assert items.fleet("blue") == {1}
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app.game.behaviour.collision import HitDetectionCommand
+from app.game.behaviour.systems import MOVE, MoveSystemCommand
+from app.game.spatial import SpatialGrid
+from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "cells"),
+    [
+        ((5, 5), (5, 5), [(0, 0)]),
+        ((5, 5), (35, 5), [(0, 0), (1, 0), (2, 0), (3, 0)]),
+        ((5, 5), (-15, 5), [(0, 0), (-1, 0), (-2, 0)]),
+        ((5, 5), (25, 15), [(0, 0), (1, 0), (1, 1), (2, 1)]),
+        # Через угол ячейки: захватываются обе соседние с углом ячейки
+        ((5, 5), (15, 15), [(0, 0), (1, 0), (0, 1), (1, 1)]),
+    ],
+)
+def test_traverse(a: tuple[int, int], b: tuple[int, int], cells: list[tuple[int, int]]) -> None:
+    grid = SpatialGrid(World(), cell_size=10)
+    assert list(grid._traverse(np.array(a), np.array(b))) == cells  # noqa: SLF001
+
+
+def test_query_segment_cells() -> None:
+    world = World()
+    grid = SpatialGrid(world, cell_size=10)
+    near, far = world.create(), world.create()
+    near.set_property("movable_position", Vector(55, 12))
+    near.set_property("collision_radius", 3)
+    # В ограничивающем прямоугольнике диагонального отрезка, но далеко от него
+    far.set_property("movable_position", Vector(95, 5))
+    far.set_property("collision_radius", 3)
+
+    assert grid.query(np.array([5, 5]), np.array([95, 95])) == set()
+    assert grid.query(np.array([5, 5]), np.array([95, 15])) == {near.index, far.index}
+
+
+def test_teleport_not_swept() -> None:
+    world = World()
+    grid = SpatialGrid(world)
+    target = world.create()
+    target.set_property("movable_position", Vector(100, 0))
+    target.set_property("collision_radius", 5)
+    torpedo = world.create()
+    torpedo.set_property("projectile", value=True)
+    torpedo.set_property("movable_position", Vector(0, 0))
+    torpedo.set_property("movable_angle", Angle(0))
+    torpedo.set_property("movable_abs_velocity", 10)
+
+    # Перестановка торпеды через цель не считается пролетом сквозь нее
+    torpedo.set_property("movable_position", Vector(200, 0))
+    world.request([torpedo.index], MOVE)
+    MoveSystemCommand(world).execute()
+    HitDetectionCommand(world, grid).execute()
+    assert not world.disabled.any()
+
+    # А движение системой - считается
+    torpedo.set_property("movable_position", Vector(90, 0))
+    torpedo.set_property("movable_abs_velocity", 20)
+    world.request([torpedo.index], MOVE)
+    MoveSystemCommand(world).execute()
+    HitDetectionCommand(world, grid).execute()
+    assert world.disabled[[target.index, torpedo.index]].all()
@@ -0,0 +1,181 @@
+import gc
+import sys
+import weakref
+from abc import ABC, abstractmethod
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.command import ICommand
+from app.core.ioc import IoC, IoCResolveDependencyError
+from app.game.behaviour.movement import IMovable
+from app.game.behaviour.systems import BURN_FUEL, BurnFuelSystemCommand
+from app.game.setup.adapters import ioc_setup_adapters
+from app.game.setup.behaviour import ioc_setup_imovable
+from app.game.uobject import (
+    ChangeTracker,
+    DerivedProperty,
+    PropertyGetter,
+    UObject,
+    UObjectImpl,
+)
+from app.game.value_types import Vector
+from app.game.world import REMOVED, ChangesNotTrackedError, World, WorldObject
+from codegen.adapter import build_adapter
+
+
+@pytest.mark.parametrize("make", [UObjectImpl, lambda: World().create()])
+def test_derived_property_cache(make: type[UObject]) -> None:
+    uobj = make()
+    uobj.set_property("fuel_amount", 10)
+    uobj.set_property("fuel_consumption", 2)
+    compute = Mock(
+        side_effect=lambda o: o.get_property("fuel_amount") // o.get_property("fuel_consumption")
+    )
+    turns_left = DerivedProperty("turns_left", ("fuel_amount", "fuel_consumption"), compute)
+
+    assert uobj.get_derived(turns_left) == 5
+    assert uobj.get_derived(turns_left) == 5
+    assert compute.call_count == 1
+
+    # Изменение постороннего свойства кеш не сбрасывает
+    uobj.set_property("movable_abs_velocity", 3)
+    assert uobj.get_derived(turns_left) == 5
+    assert compute.call_count == 1
+
+    uobj.set_property("fuel_amount", 4)
+    assert uobj.get_derived(turns_left) == 2
+    assert compute.call_count == 2
+
+
+def test_change_tracker() -> None:
+    tracker = ChangeTracker()
+    uobj = UObjectImpl(object_id=7, tracker=tracker)
+    uobj.set_property("fuel_amount", 10)
+    uobj.set_property("fuel_amount", 9)
+    uobj.set_property("name", "Enterprise")
+
+    assert tracker.drain() == {(7, "fuel_amount"), (7, "name")}
+    assert tracker.drain() == set()
+
+
+def test_world_changes() -> None:
+    world = World(capacity=1)
+    with pytest.raises(ChangesNotTrackedError):
+        world.drain_changes()
+
+    world.track_changes()
+    ship, torpedo = world.create(object_id=10), world.create(object_id=20)
+    ship.set_property("fuel_amount", 10)
+    ship.set_property("fuel_consumption", 1)
+    torpedo.set_property("name", "torpedo")
+    assert world.drain_changes() == {
+        (10, "fuel_amount"),
+        (10, "fuel_consumption"),
+        (20, "name"),
+    }
+
+    # Изменения, сделанные системами напрямую в массивах
+    world.request([ship.index], BURN_FUEL)
+    BurnFuelSystemCommand(world).execute()
+    assert world.drain_changes() == {(10, "fuel_amount")}
+    assert world.drain_changes() == set()
+
+    # Изменения удаленного объекта не достаются объекту, занявшему его строку
+    torpedo.set_property("name", "old torpedo")
+    world.remove(torpedo.index)
+    world.create(object_id=30).set_property("fuel_amount", 5)
+    assert world.drain_changes() == {(20, REMOVED), (30, "fuel_amount")}
+    assert world.drain_changes() == set()
+
+
+@pytest.mark.parametrize("make", [UObjectImpl, lambda: World().create()])
+def test_adapter_cache(make: type[UObject]) -> None:
+    ioc_setup_imovable()
+    ioc_setup_adapters()
+    uobj, other = make(), make()
+    uobj.set_property("movable_position", Vector(1, 2))
+
+    movable = IoC[IMovable].resolve("Adapter", IMovable, uobj)
+    assert IoC[IMovable].resolve("Adapter", IMovable, uobj) is movable
+    assert IoC[IMovable].resolve("Adapter", IMovable, other) is not movable
+    assert movable.get_position() == Vector(1, 2)
+
+
+def test_adapter_cache_no_cycle() -> None:
+    """
+    Адаптер из кеша не удерживает объект, который хранит кеш
+    """
+    ioc_setup_imovable()
+    ioc_setup_adapters()
+    uobj = UObjectImpl()
+    uobj.set_property("movable_position", Vector(1, 2))
+    assert IoC[IMovable].resolve("Adapter", IMovable, uobj).get_position() == Vector(1, 2)
+
+    # Без сборщика мусора объект освобождается, как только на него не остается ссылок
+    ref = weakref.ref(uobj)
+    gc.disable()
+    try:
+        del uobj
+        assert ref() is None
+    finally:
+        gc.enable()
+
+    world = World()
+    world_obj = world.create()
+    world_obj.set_property("movable_position", Vector(1, 2))
+    world_refs = sys.getrefcount(world)
+    movable = IoC[IMovable].resolve("Adapter", IMovable, world_obj)
+    assert movable.get_position() == Vector(1, 2)
+    assert sys.getrefcount(world) == world_refs
+
+    # WorldObject создается заново, а кеш остается у строки World
+    same_row = WorldObject(world, world_obj.index)
+    assert IoC[IMovable].resolve("Adapter", IMovable, same_row) is movable
+
+
+def test_adapter_direct_binding() -> None:
+    ioc_setup_imovable()
+    ioc_setup_adapters()
+    uobj = UObjectImpl()
+    uobj.set_property("movable_position", Vector(1, 2))
+    movable = IoC[IMovable].resolve("Adapter", IMovable, uobj)
+
+    movable.set_position(Vector(3, 4))
+    assert movable.get_position() == Vector(3, 4)
+
+    # После перерегистрации стратегии адаптер привязывается к новой
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "IMovable.position.Get", lambda _: Vector(0, 0)
+    ).execute()
+    assert movable.get_position() == Vector(0, 0)
+
+
+class ITestPartial(ABC):
+    @abstractmethod
+    def get_registered(self) -> int: ...
+
+    @abstractmethod
+    def get_missing(self) -> int: ...
+
+
+def test_adapter_direct_missing_strategy() -> None:
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "ITestPartial.registered.Get", PropertyGetter("registered")
+    ).execute()
+    uobj = UObjectImpl()
+    uobj.set_property("registered", 1)
+    uobj.set_property("missing", 2)
+    partial = build_adapter(ITestPartial)(uobj)
+
+    # Незарегистрированная стратегия ломает только свой метод
+    with pytest.raises(IoCResolveDependencyError):
+        partial.get_missing()
+    assert partial.get_registered() == 1
+    with pytest.raises(IoCResolveDependencyError):
+        partial.get_missing()
+
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "ITestPartial.missing.Get", PropertyGetter("missing")
+    ).execute()
+    assert partial.get_missing() == 2
@@ -1,3 +1,6 @@
+import math
+import pickle
+
 import pytest
 
 from app.game.value_types import Angle, AngleAdditionError, Vector
@@ -8,9 +11,15 @@ def test_vector_add() -> None:
     assert v.x == 5
     assert v.y == 6
 
+    shared = v
     v += Vector(1, 1)
     assert v.x == 6
     assert v.y == 7
+    # += не меняет общий объект
+    assert shared == Vector(5, 6)
+
+    with pytest.raises(AttributeError):
+        v.x = 0  # pyright: ignore[reportAttributeAccessIssue]
 
 
 DIRS_NUMBER = 72
@@ -42,3 +51,30 @@ def test_angle() -> None:
 def test_angle_different_directions_number() -> None:
     with pytest.raises(AngleAdditionError):
         Angle(1, 2) + Angle(1, 3)  # pyright: ignore[reportUnusedExpression]
+
+
+def test_vector_from_angle_table() -> None:
+    # Табличные cos/sin дают тот же результат, что и прямое вычисление
+    for directions_number in (4, 36, DIRS_NUMBER):
+        for direction in range(directions_number):
+            angle = Angle(direction, directions_number)
+            for length in (1, 7.5, 1000):
+                expected = Vector(
+                    round(length * math.cos(angle.to_rads())),
+                    round(length * math.sin(angle.to_rads())),
+                )
+                assert Vector.from_angle_and_length(angle, length) == expected
+
+
+def test_angle_interned() -> None:
+    angle = Angle(10, DIRS_NUMBER)
+    assert Angle(10, DIRS_NUMBER) is angle
+    assert Angle.from_degrees(50, DIRS_NUMBER) is angle
+    assert Angle(4, DIRS_NUMBER) + Angle(6, DIRS_NUMBER) is angle
+    assert pickle.loads(pickle.dumps(angle)) is angle
+
+    # += не меняет общий объект
+    total = Angle(10, DIRS_NUMBER)
+    total += Angle(1, DIRS_NUMBER)
+    assert angle.direction == 10
+    assert total is Angle(11, DIRS_NUMBER)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from app.core.ioc import IoC
+from app.game.behaviour.movement import IMovable, MoveCommand
+from app.game.setup.adapters import ioc_setup_adapters
+from app.game.setup.behaviour import ioc_setup_imovable
+from app.game.uobject import UObjectImpl
+from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+
+def test_world_object_properties() -> None:
+    world = World()
+    uobj = world.create()
+
+    uobj.set_property("movable_position", Vector(1, -2))
+    uobj.set_property("movable_angle", Angle(5, 8))
+    uobj.set_property("movable_abs_velocity", 2.5)
+    uobj.set_property("fuel_amount", 10)
+    uobj.set_property("name", "Enterprise")
+
+    assert uobj.get_property("movable_position") == Vector(1, -2)
+    assert uobj.get_property("movable_angle").to_degrees() == Angle(5, 8).to_degrees()
+    assert uobj.get_property("movable_abs_velocity") == 2.5
+    assert uobj.get_property("fuel_amount") == 10
+    assert uobj.get_property("name") == "Enterprise"
+
+    # Как и у UObjectImpl, незаданное свойство - KeyError
+    with pytest.raises(KeyError):
+        uobj.get_property("fuel_consumption")
+    with pytest.raises(KeyError):
+        uobj.get_property("unknown")
+
+
+def test_world_grow_and_reuse() -> None:
+    world = World(capacity=2)
+    objects = [world.create() for _ in range(5)]
+    for i, uobj in enumerate(objects):
+        uobj.set_property("movable_position", Vector(i, i))
+
+    assert world.capacity >= 5
+    assert len(world) == 5
+    assert [uobj.get_property("movable_position") for uobj in objects] == [
+        Vector(i, i) for i in range(5)
+    ]
+
+    world.remove(objects[1].index)
+    assert len(world) == 4
+    reused = world.create()
+    assert reused.index == objects[1].index
+    with pytest.raises(KeyError):
+        reused.get_property("movable_position")
+
+    assert np.flatnonzero(world.mask("movable_position")).tolist() == [0, 2, 3, 4]
+
+
+def test_move_world_object() -> None:
+    ioc_setup_imovable()
+    ioc_setup_adapters()
+
+    # Адаптеры работают с объектами World так же, как с UObjectImpl
+    world = World()
+    for uobj in (UObjectImpl(), world.create()):
+        uobj.set_property("movable_position", Vector(12, 5))
+        uobj.set_property("movable_angle", Vector(-7, 3).get_angle())
+        uobj.set_property("movable_abs_velocity", Vector(-7, 3).get_length())
+
+        movable = IoC[IMovable].resolve("Adapter", IMovable, uobj)
+        MoveCommand(movable).execute()
+        assert movable.get_position() == Vector(5, 8)
@@ -1,18 +1,139 @@
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
 from typing import Any, override
 
 
+@dataclass(frozen=True)
+class DerivedProperty:
+    """
+    Свойство, вычисляемое по другим свойствам объекта (sources)
+    """
+
+    name: str
+    sources: tuple[str, ...]
+    compute: Callable[["UObject"], Any]
+
+
 class UObject(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_property(self, prop: str) -> Any: ...
 
     @abstractmethod
     def set_property(self, prop: str, value: Any) -> None: ...
 
+    def get_derived(self, prop: DerivedProperty) -> Any:
+        """
+        Значение вычисляемого свойства. Реализации могут кешировать его
+        до изменения любого из исходных свойств, поэтому менять значение на месте нельзя.
+        """
+        return prop.compute(self)
+
+    def get_adapters(self) -> dict[type, Any] | None:
+        """
+        Кеш адаптеров объекта (интерфейс -> адаптер) или None, если объект их не кеширует.
+        Кеш хранится в самом объекте, поэтому адаптеры не переживают объект.
+        """
+        return None
+
+    def get_adapter_target(self) -> "UObject":
+        """
+        Объект, над которым строятся адаптеры из кеша get_adapters.
+        Он не удерживает владельца кеша, иначе адаптер и объект образуют цикл ссылок.
+        """
+        return self
+
+
+class WeakUObject(UObject):
+    """
+    Слабая ссылка на объект: обращения после удаления объекта бросают ReferenceError
+    """
+
+    __slots__ = ("_uobject",)
+
+    def __init__(self, uobject: UObject) -> None:
+        self._uobject = weakref.proxy(uobject)
+
+    @override
+    def get_property(self, prop: str) -> Any:
+        return self._uobject.get_property(prop)
+
+    @override
+    def set_property(self, prop: str, value: Any) -> None:
+        self._uobject.set_property(prop, value)
+
+    @override
+    def get_derived(self, prop: DerivedProperty) -> Any:
+        return self._uobject.get_derived(prop)
+
+
+@dataclass(frozen=True, slots=True)
+class PropertyGetter:
+    """
+    Стратегия, которая только читает свойство объекта.
+    Сгенерированные адаптеры с прямой привязкой вызывают get_property объекта напрямую.
+    """
+
+    prop: str
+
+    def __call__(self, uobj: UObject) -> Any:
+        return uobj.get_property(self.prop)
+
+
+@dataclass(frozen=True, slots=True)
+class PropertySetter:
+    """
+    Стратегия, которая только записывает свойство объекта
+    """
+
+    prop: str
+
+    def __call__(self, uobj: UObject, value: Any) -> None:
+        uobj.set_property(self.prop, value)
+
+
+def bind_strategy(strategy: Callable[..., Any], uobj: UObject) -> Callable[..., Any]:
+    """
+    Стратегия адаптера с привязанным объектом.
+    Чтение и запись свойства привязываются прямо к методам объекта, минуя стратегию.
+    """
+    if isinstance(strategy, PropertyGetter):
+        return partial(uobj.get_property, strategy.prop)
+    if isinstance(strategy, PropertySetter):
+        return partial(uobj.set_property, strategy.prop)
+    return partial(strategy, uobj)
+
+
+class ChangeTracker:
+    """
+    Изменения свойств объектов игры (id объекта, свойство), накопленные с прошлого drain
+    """
 
-class UObjectImpl(UObject):
     def __init__(self) -> None:
+        self._changes: set[tuple[int, str]] = set()
+
+    def mark(self, object_id: int, prop: str) -> None:
+        self._changes.add((object_id, prop))
+
+    def drain(self) -> set[tuple[int, str]]:
+        changes, self._changes = self._changes, set()
+        return changes
+
+
+class UObjectImpl(UObject):
+    def __init__(self, object_id: int = 0, tracker: ChangeTracker | None = None) -> None:
         self._props: dict[str, Any] = {}
+        # Без трекера изменения не учитываются
+        self._object_id = object_id
+        self._tracker = tracker
+        # Закешированные вычисляемые свойства и какие из них зависят от каждого свойства
+        self._derived: dict[str, Any] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._adapters: dict[type, Any] = {}
 
     @override
     def get_property(self, prop: str) -> Any:
@@ -21,3 +142,29 @@ class UObjectImpl(UObject):
     @override
     def set_property(self, prop: str, value: Any) -> None:
         self._props[prop] = value
+        if self._tracker is not None:
+            self._tracker.mark(self._object_id, prop)
+        if self._derived:
+            for name in self._dependents.get(prop, ()):
+                self._derived.pop(name, None)
+
+    @override
+    def get_derived(self, prop: DerivedProperty) -> Any:
+        try:
+            return self._derived[prop.name]
+        except KeyError:
+            pass
+
+        value = prop.compute(self)
+        self._derived[prop.name] = value
+        for source in prop.sources:
+            self._dependents.setdefault(source, set()).add(prop.name)
+        return value
+
+    @override
+    def get_adapters(self) -> dict[type, Any]:
+        return self._adapters
+
+    @override
+    def get_adapter_target(self) -> UObject:
+        return WeakUObject(self)
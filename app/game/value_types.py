@@ -1,22 +1,46 @@
 from __future__ import annotations
 
 import math
-from typing import Self
+from functools import cache
+from typing import Any, ClassVar, Self
 
 DEFAULT_DIRECTIONS_NUMBER = 72
 
 
+@cache
+def trig_table(directions_number: int) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """
+    cos и sin всех направлений. Значения совпадают с math.cos/sin(Angle.to_rads()).
+    """
+    step = 2 * math.pi / directions_number
+    return (
+        tuple(math.cos(d * step) for d in range(directions_number)),
+        tuple(math.sin(d * step) for d in range(directions_number)),
+    )
+
+
 class Vector:
+    """
+    Неизменяемый вектор: один объект можно безопасно разделять между объектами игры
+    """
+
+    __slots__ = ("_x", "_y")
+
     def __init__(self, x: int, y: int) -> None:
-        self.x = x
-        self.y = y
+        self._x = x
+        self._y = y
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @property
+    def y(self) -> int:
+        return self._y
 
     @classmethod
     def from_angle_and_length(cls, angle: Angle, length: float) -> Self:
-        return cls(
-            round(length * math.cos(angle.to_rads())),
-            round(length * math.sin(angle.to_rads())),
-        )
+        return cls(round(length * angle._cos), round(length * angle._sin))  # noqa: SLF001
 
     def get_length(self) -> float:
         return math.sqrt(pow(self.x, 2) + pow(self.y, 2))
@@ -25,12 +49,8 @@ class Vector:
         return Angle.from_rads(math.atan2(self.y, self.x), directions_number)
 
     def __add__(self, other: Vector) -> Vector:
-        return Vector(self.x + other.x, self.y + other.y)
-
-    def __iadd__(self, other: Vector) -> Self:
-        self.x += other.x
-        self.y += other.y
-        return self
+        # += тоже идет сюда и создает новый вектор
+        return Vector(self._x + other._x, self._y + other._y)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vector):
@@ -42,9 +62,35 @@ class Vector:
 
 
 class Angle:
-    def __init__(self, direction: int, directions_number: int = DEFAULT_DIRECTIONS_NUMBER) -> None:
-        self._direction = direction
-        self._directions_number = directions_number
+    """
+    Направление, квантованное на directions_number частей. Неизменяемый:
+    углы из [0, directions_number) интернируются, так что повторное создание
+    и сложение углов возвращают уже существующие объекты.
+    cos и sin угла считаются один раз, при создании.
+    """
+
+    __slots__ = ("_cos", "_direction", "_directions_number", "_sin")
+
+    _interned: ClassVar[dict[tuple[int, int], Any]] = {}
+
+    def __new__(cls, direction: int, directions_number: int = DEFAULT_DIRECTIONS_NUMBER) -> Self:
+        key = (direction, directions_number)
+        angle = cls._interned.get(key)
+        if angle is None:
+            angle = super().__new__(cls)
+            angle._direction = direction  # noqa: SLF001
+            angle._directions_number = directions_number  # noqa: SLF001
+            if 0 <= direction < directions_number:
+                cos, sin = trig_table(directions_number)
+                angle._cos, angle._sin = cos[direction], sin[direction]  # noqa: SLF001
+                angle = cls._interned.setdefault(key, angle)
+            else:
+                rads = angle.to_rads()
+                angle._cos, angle._sin = math.cos(rads), math.sin(rads)  # noqa: SLF001
+        return angle
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self), (self._direction, self._directions_number))
 
     @classmethod
     def from_degrees(
@@ -58,6 +104,14 @@ class Angle:
         direction = round((rads / 2 / math.pi) * directions_number) % directions_number
         return cls(direction, directions_number)
 
+    @property
+    def direction(self) -> int:
+        return self._direction
+
+    @property
+    def directions_number(self) -> int:
+        return self._directions_number
+
     def to_degrees(self) -> float:
         return self._direction * (360 / self._directions_number)
 
@@ -71,15 +125,11 @@ class Angle:
             )
 
     def __add__(self, other: Angle) -> Angle:
+        # += тоже идет сюда: интернированный угол нельзя менять на месте
         self._check_same_directions_number(other)
         new_dir = (self._direction + other._direction) % self._directions_number
         return Angle(new_dir, self._directions_number)
 
-    def __iadd__(self, other: Angle) -> Self:
-        self._check_same_directions_number(other)
-        self._direction = (self._direction + other._direction) % self._directions_number
-        return self
-
     def __repr__(self) -> str:
         return (
             f"Angle(direction={self._direction}/{self._directions_number}, "
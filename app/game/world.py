@@ -0,0 +1,418 @@
+import weakref
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, override
+
+import numpy as np
+import numpy.typing as npt
+
+from app.game.uobject import DerivedProperty, UObject
+from app.game.value_types import Angle, Vector
+
+# Свойства, которые хранятся в массивах World. Остальные свойства объекта лежат в словаре.
+STORED_PROPERTIES = (
+    "movable_position",
+    "movable_angle",
+    "movable_abs_velocity",
+    "rotatable_angle",
+    "rotatable_angular_velocity",
+    "fuel_amount",
+    "fuel_consumption",
+    "collision_radius",
+    "projectile",
+    "disabled",
+)
+
+INITIAL_CAPACITY = 64
+
+# Свойство в World.drain_changes, означающее удаление объекта
+REMOVED = "World.removed"
+
+Indices = Sequence[int] | npt.NDArray[np.intp]
+Observer = Callable[[npt.NDArray[np.intp]], None]
+
+
+class World:
+    """
+    Хранилище состояния объектов игры в виде структуры массивов.
+    Каждому объекту соответствует индекс (строка) во всех массивах, поэтому системы
+    могут обновлять все объекты игры одной векторной операцией над массивом.
+    Углы хранятся парой (direction, directions_number).
+    has[i, j] - задано ли у объекта i свойство STORED_PROPERTIES[j].
+    object_ids[i] - id объекта в Game.items.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        self.used = np.zeros(capacity, dtype=np.bool_)
+        self.object_ids = np.zeros(capacity, dtype=np.int64)
+        self.has = np.zeros((capacity, len(STORED_PROPERTIES)), dtype=np.bool_)
+        self.position = np.zeros((capacity, 2), dtype=np.int64)
+        self.movable_angle = np.zeros((capacity, 2), dtype=np.int64)
+        self.abs_velocity = np.zeros(capacity, dtype=np.float64)
+        self.rotatable_angle = np.zeros((capacity, 2), dtype=np.int64)
+        self.angular_velocity = np.zeros((capacity, 2), dtype=np.int64)
+        self.fuel_amount = np.zeros(capacity, dtype=np.int64)
+        self.fuel_consumption = np.zeros(capacity, dtype=np.int64)
+        self.collision_radius = np.zeros(capacity, dtype=np.float64)
+        self.projectile = np.zeros(capacity, dtype=np.bool_)
+        self.disabled = np.zeros(capacity, dtype=np.bool_)
+
+        # Граница занятых индексов и освободившиеся индексы ниже нее
+        self._size = 0
+        self._free: list[int] = []
+        # Свойства, для которых нет массивов: индекс -> словарь свойств
+        self._extra: dict[int, dict[str, Any]] = {}
+        # Закешированные вычисляемые свойства: индекс -> имя -> значение
+        self._derived: dict[int, dict[str, Any]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        # Закешированные адаптеры: индекс -> интерфейс -> адаптер
+        self._adapters: dict[int, dict[type, Any]] = {}
+        # Измененные свойства, пока их никто не читает - не отслеживаются (см. track_changes)
+        self._dirty: npt.NDArray[np.bool_] | None = None
+        self._dirty_extra: dict[int, set[str]] = {}
+        # id удаленных объектов
+        self._removed: set[int] = set()
+        # Подписчики на изменение свойств: свойство -> функции от индексов объектов
+        self._observers: dict[str, list[Observer]] = {}
+        # Просьбы обработать объекты в ближайший квант: система -> маска объектов
+        self._requests: dict[str, npt.NDArray[np.bool_]] = {}
+
+        self._accessors: dict[str, tuple[int, Callable[[int], Any], Callable[[int, Any], None]]] = {
+            prop: (column, getattr(self, f"_get_{prop}"), getattr(self, f"_set_{prop}"))
+            for column, prop in enumerate(STORED_PROPERTIES)
+        }
+
+    @property
+    def capacity(self) -> int:
+        return len(self.used)
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def create(self, object_id: int | None = None) -> "WorldObject":
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._grow(self.capacity * 2)
+            index = self._size
+            self._size += 1
+
+        self.used[index] = True
+        self.has[index] = False
+        self.object_ids[index] = index if object_id is None else object_id
+        return WorldObject(self, index)
+
+    def remove(self, index: int) -> None:
+        self.used[index] = False
+        self.has[index] = False
+        self._extra.pop(index, None)
+        self._derived.pop(index, None)
+        self._adapters.pop(index, None)
+        if self._dirty is not None:
+            self._dirty[index] = False
+            self._dirty_extra.pop(index, None)
+            self._removed.add(self.object_ids[index].item())
+        for requested in self._requests.values():
+            requested[index] = False
+        self._free.append(index)
+        self._notify([index], self._observers)
+
+    def adapters(self, index: int) -> dict[type, Any]:
+        """
+        Кеш адаптеров объекта. Он привязан к индексу, а не к WorldObject,
+        потому что WorldObject - легкая ссылка на строку и создается заново.
+        """
+        return self._adapters.setdefault(index, {})
+
+    def mask(self, *props: str) -> npt.NDArray[np.bool_]:
+        """
+        Маска объектов, у которых заданы все перечисленные свойства
+        """
+        columns = [self._accessors[prop][0] for prop in props]
+        return self.used & self.has[:, columns].all(axis=1)
+
+    def get_property(self, index: int, prop: str) -> Any:
+        accessor = self._accessors.get(prop)
+        if accessor is None:
+            try:
+                return self._extra[index][prop]
+            except KeyError:
+                raise KeyError(prop) from None
+
+        column, getter, _ = accessor
+        if not self.has[index, column]:
+            raise KeyError(prop)
+        return getter(index)
+
+    def set_property(self, index: int, prop: str, value: Any) -> None:
+        accessor = self._accessors.get(prop)
+        if accessor is None:
+            self._extra.setdefault(index, {})[prop] = value
+        else:
+            column, _, setter = accessor
+            setter(index, value)
+            self.has[index, column] = True
+
+        if self._derived or self._dirty is not None or self._observers:
+            self.changed([index], prop)
+        if self._observers:
+            self._notify([index], (written(prop),))
+
+    def get_derived(self, index: int, prop: DerivedProperty) -> Any:
+        cache = self._derived.get(index)
+        if cache is not None and prop.name in cache:
+            return cache[prop.name]
+
+        value = prop.compute(WorldObject(self, index))
+        self._derived.setdefault(index, {})[prop.name] = value
+        for source in prop.sources:
+            self._dependents.setdefault(source, set()).add(prop.name)
+        return value
+
+    def request(self, indices: Indices, system: str) -> None:
+        """
+        Просит систему system обработать объекты indices в ближайший квант.
+        Система обрабатывает объект один раз на просьбу, а не каждый квант.
+        """
+        requested = self._requests.get(system)
+        if requested is None:
+            requested = self._requests[system] = np.zeros(self.capacity, dtype=np.bool_)
+        requested[indices] = True
+
+    def take_requests(self, system: str) -> npt.NDArray[np.bool_]:
+        """
+        Маска объектов, которые просили систему system их обработать. Просьбы сбрасываются.
+        """
+        requested = self._requests.get(system)
+        if requested is None:
+            return np.zeros(self.capacity, dtype=np.bool_)
+        mask = requested & self.used
+        requested[:] = False
+        return mask
+
+    def observe(self, props: Sequence[str], observer: Observer) -> None:
+        """
+        observer вызывается с индексами объектов, у которых изменилось любое из props
+        или которые были удалены.
+        Чтобы получать только записи через set_property, а не изменения из систем,
+        нужно подписаться на written(prop).
+        """
+        for prop in props:
+            self._observers.setdefault(prop, []).append(observer)
+
+    def changed(self, indices: Indices, *props: str) -> None:
+        """
+        Отмечает изменение props у объектов indices: сбрасывает зависящие от них
+        вычисляемые свойства, сообщает подписчикам и, если изменения отслеживаются,
+        запоминает их.
+        Системы, которые пишут в массивы напрямую, должны вызывать его для измененных строк.
+        """
+        if self._observers:
+            self._notify(indices, props)
+
+        if self._dirty is not None:
+            self._mark_dirty(self._dirty, indices, props)
+
+        if not self._derived:
+            return
+        names = set().union(*(self._dependents.get(prop, ()) for prop in props))
+        if not names:
+            return
+        for index in indices:
+            cache = self._derived.get(index)
+            if cache:
+                for name in names:
+                    cache.pop(name, None)
+
+    def _mark_dirty(
+        self, dirty: npt.NDArray[np.bool_], indices: Indices, props: Iterable[str]
+    ) -> None:
+        for prop in props:
+            accessor = self._accessors.get(prop)
+            if accessor is None:
+                for index in indices:
+                    self._dirty_extra.setdefault(int(index), set()).add(prop)
+            else:
+                dirty[indices, accessor[0]] = True
+
+    def _notify(self, indices: Indices, props: Iterable[str]) -> None:
+        observers = {observer for prop in props for observer in self._observers.get(prop, ())}
+        if observers:
+            rows = np.asarray(indices, dtype=np.intp)
+            for observer in observers:
+                observer(rows)
+
+    def track_changes(self) -> None:
+        """
+        Включает отслеживание изменений для drain_changes.
+        Без него запись свойств не тратит время на учет изменений.
+        """
+        if self._dirty is None:
+            self._dirty = np.zeros_like(self.has)
+
+    def drain_changes(self) -> set[tuple[int, str]]:
+        """
+        Изменения (id объекта, свойство) с прошлого вызова. Обычно вызывается раз в квант.
+        Удаление объекта - изменение (id объекта, REMOVED). Если id успели занять заново,
+        изменения свойств нового объекта тоже попадают в результат.
+        """
+        if self._dirty is None:
+            raise ChangesNotTrackedError
+
+        rows, columns = np.nonzero(self._dirty)
+        self._dirty[rows, columns] = False
+        changes = {
+            (object_id, STORED_PROPERTIES[column])
+            for object_id, column in zip(
+                self.object_ids[rows].tolist(), columns.tolist(), strict=True
+            )
+        }
+        changes.update(
+            (self.object_ids[index].item(), prop)
+            for index, props in self._dirty_extra.items()
+            for prop in props
+        )
+        changes.update((object_id, REMOVED) for object_id in self._removed)
+        self._dirty_extra.clear()
+        self._removed.clear()
+        return changes
+
+    def _grow(self, capacity: int) -> None:
+        for name in (
+            "used",
+            "object_ids",
+            "has",
+            "position",
+            "movable_angle",
+            "abs_velocity",
+            "rotatable_angle",
+            "angular_velocity",
+            "fuel_amount",
+            "fuel_consumption",
+            "collision_radius",
+            "projectile",
+            "disabled",
+            *(("_dirty",) if self._dirty is not None else ()),
+        ):
+            old: npt.NDArray[Any] = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+        for system, old_requested in self._requests.items():
+            requested = np.zeros(capacity, dtype=np.bool_)
+            requested[: len(old_requested)] = old_requested
+            self._requests[system] = requested
+
+    def _get_movable_position(self, index: int) -> Vector:
+        x, y = self.position[index].tolist()
+        return Vector(x, y)
+
+    def _set_movable_position(self, index: int, value: Vector) -> None:
+        self.position[index] = (value.x, value.y)
+
+    def _get_movable_angle(self, index: int) -> Angle:
+        return Angle(*self.movable_angle[index].tolist())
+
+    def _set_movable_angle(self, index: int, value: Angle) -> None:
+        self.movable_angle[index] = (value.direction, value.directions_number)
+
+    def _get_movable_abs_velocity(self, index: int) -> float:
+        return self.abs_velocity[index].item()
+
+    def _set_movable_abs_velocity(self, index: int, value: float) -> None:
+        self.abs_velocity[index] = value
+
+    def _get_rotatable_angle(self, index: int) -> Angle:
+        return Angle(*self.rotatable_angle[index].tolist())
+
+    def _set_rotatable_angle(self, index: int, value: Angle) -> None:
+        self.rotatable_angle[index] = (value.direction, value.directions_number)
+
+    def _get_rotatable_angular_velocity(self, index: int) -> Angle:
+        return Angle(*self.angular_velocity[index].tolist())
+
+    def _set_rotatable_angular_velocity(self, index: int, value: Angle) -> None:
+        self.angular_velocity[index] = (value.direction, value.directions_number)
+
+    def _get_fuel_amount(self, index: int) -> int:
+        return self.fuel_amount[index].item()
+
+    def _set_fuel_amount(self, index: int, value: int) -> None:
+        self.fuel_amount[index] = value
+
+    def _get_fuel_consumption(self, index: int) -> int:
+        return self.fuel_consumption[index].item()
+
+    def _set_fuel_consumption(self, index: int, value: int) -> None:
+        self.fuel_consumption[index] = value
+
+    def _get_collision_radius(self, index: int) -> float:
+        return self.collision_radius[index].item()
+
+    def _set_collision_radius(self, index: int, value: float) -> None:
+        self.collision_radius[index] = value
+
+    def _get_projectile(self, index: int) -> bool:
+        return self.projectile[index].item()
+
+    def _set_projectile(self, index: int, value: bool) -> None:  # noqa: FBT001
+        self.projectile[index] = value
+
+    def _get_disabled(self, index: int) -> bool:
+        return self.disabled[index].item()
+
+    def _set_disabled(self, index: int, value: bool) -> None:  # noqa: FBT001
+        self.disabled[index] = value
+
+
+def written(prop: str) -> str:
+    """
+    Событие World: свойство prop записали через set_property
+    """
+    return f"{prop}.Set"
+
+
+class WorldObject(UObject):
+    """
+    Объект игры, состояние которого лежит в World: сам объект хранит только индекс.
+    Значения возвращаются копиями, изменять их на месте бесполезно.
+    """
+
+    __slots__ = ("_index", "_world")
+
+    def __init__(self, world: World, index: int) -> None:
+        self._world = world
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @override
+    def get_property(self, prop: str) -> Any:
+        return self._world.get_property(self._index, prop)
+
+    @override
+    def set_property(self, prop: str, value: Any) -> None:
+        self._world.set_property(self._index, prop, value)
+
+    @override
+    def get_derived(self, prop: DerivedProperty) -> Any:
+        return self._world.get_derived(self._index, prop)
+
+    @override
+    def get_adapters(self) -> dict[type, Any]:
+        return self._world.adapters(self._index)
+
+    @override
+    def get_adapter_target(self) -> UObject:
+        # Кеш лежит в World, поэтому адаптер держит World по слабой ссылке
+        return WorldObject(weakref.proxy(self._world), self._index)
+
+    def __repr__(self) -> str:
+        return f"WorldObject(index={self._index})"
+
+
+class ChangesNotTrackedError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Changes are not tracked, call World.track_changes first")
@@ -1,19 +1,59 @@
+import argparse
+import gc
+from functools import partial
+from pathlib import Path
+
 from app import endpoint
 from app.core import ioc_scoped
 from app.game.setup import message_handlers
 from app.game.setup.adapters import ioc_setup_adapters
+from app.rebalancer import Rebalancer
 from app.server import Server
+from app.sharded_server import ShardedServer
 
+EVENT_LOOP_COUNT = 3
 
-def main() -> None:
+
+def ioc_setup_game(adapter_cache: Path | None = None) -> None:
     ioc_scoped.setup()
-    ioc_setup_adapters()
+    ioc_setup_adapters(adapter_cache)
 
     message_handlers.ioc_setup_move()
 
-    server = Server(event_loop_count=3)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Space Battle Server")
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="run each event loop in its own process",
+    )
+    parser.add_argument(
+        "--adapter-cache",
+        type=Path,
+        help="directory to keep compiled adapters between runs",
+    )
+    args = parser.parse_args()
+    setup = partial(ioc_setup_game, args.adapter_cache)
+
+    setup()
+
+    rebalancer: Rebalancer | None = None
+    if args.processes:
+        server = ShardedServer(event_loop_count=EVENT_LOOP_COUNT, setup=setup)
+    else:
+        server = Server(event_loop_count=EVENT_LOOP_COUNT)
+        # Перенос игр между ивент лупами возможен только внутри одного процесса
+        rebalancer = Rebalancer(server)
     server.start()
+    if rebalancer:
+        rebalancer.start()
+    # Объекты, созданные при запуске, живут до конца работы: убираем их из поколений GC,
+    # чтобы полные сборки во время боя их не обходили
+    gc.freeze()
     endpoint.start()
+    if rebalancer:
+        rebalancer.stop()
     server.stop()
 
 
@@ -0,0 +1,34 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class EventLoopLoad:
+    """
+    Снимок нагрузки ивент лупа для выбора, куда поместить новую игру
+    """
+
+    event_loop_id: int
+    games: int
+    queue_depth: int = 0
+    tick_time: float = 0.0
+    lag: float = 0.0
+
+
+PlacementPolicy = Callable[[list[EventLoopLoad]], int]
+
+
+def least_games_policy(loads: list[EventLoopLoad]) -> int:
+    return min(loads, key=lambda load: (load.games, load.event_loop_id)).event_loop_id
+
+
+def least_queue_depth_policy(loads: list[EventLoopLoad]) -> int:
+    return min(
+        loads, key=lambda load: (load.queue_depth, load.games, load.event_loop_id)
+    ).event_loop_id
+
+
+def least_tick_time_policy(loads: list[EventLoopLoad]) -> int:
+    return min(
+        loads, key=lambda load: (load.tick_time, load.games, load.event_loop_id)
+    ).event_loop_id
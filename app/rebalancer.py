@@ -0,0 +1,75 @@
+import threading
+from datetime import timedelta
+
+from loguru import logger
+
+from app.server import Server
+
+
+class Rebalancer:
+    """
+    Периодически переносит игру из самого отстающего ивент лупа в наименее отстающий.
+    Отставание - сглаженное опоздание квантов игр (EventLoop.lag).
+    За один шаг переносится не больше одной игры, чтобы не раскачивать нагрузку.
+    """
+
+    def __init__(
+        self,
+        server: Server,
+        interval: timedelta = timedelta(seconds=5),
+        lag_threshold: timedelta = timedelta(milliseconds=50),
+    ) -> None:
+        self._server = server
+        self._interval = interval.total_seconds()
+        self._lag_threshold = lag_threshold.total_seconds()
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.rebalance()
+            except Exception:
+                logger.exception("Rebalancing failed")
+
+    def rebalance(self) -> bool:
+        """
+        Делает один шаг балансировки. Возвращает True, если игра была перенесена.
+        """
+        loads = self._server.event_loop_loads()
+        if len(loads) < 2:
+            return False
+
+        # Из лупа с единственной игрой переносить бессмысленно: отставание уедет вместе с ней
+        sources = [load for load in loads if load.games > 1]
+        if not sources:
+            return False
+        source = max(sources, key=lambda load: (load.lag, -load.event_loop_id))
+        target = min(loads, key=lambda load: (load.lag, load.games, load.event_loop_id))
+
+        if source.lag - target.lag < self._lag_threshold:
+            return False
+
+        game_ids = self._server.game_ids(source.event_loop_id)
+        if not game_ids:
+            return False
+
+        game_id = game_ids[-1]
+        logger.info(
+            f"Rebalancing: moving game {game_id} from event loop {source.event_loop_id} "
+            f"(lag {source.lag:.3f}s) to event loop {target.event_loop_id} (lag {target.lag:.3f}s)"
+        )
+        self._server.migrate_game(game_id, target.event_loop_id)
+        return True
@@ -1,20 +1,30 @@
+import threading
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 from datetime import timedelta
+from functools import partial
 from queue import Queue
 from typing import Any, override
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from app.core.command import ICommand, MacroCommand
-from app.core.ioc import IoC
+from app.core.command import Action, ICommand
+from app.core.ioc import IoC, Resolver
+from app.game.registry import ObjectRegistry
+from app.game.setup.behaviour import ioc_setup_systems
 from app.game.setup.state import ioc_setup_event_loop, ioc_setup_exception_handler_store
 from app.game.state.event_loop import (
     EventLoop,
     HardStopEventLoopCommand,
+    RepeatCommand,
     RunEventLoopInThreadCommand,
+    SoftStopEventLoopCommand,
 )
-from app.game.state.exception_handlers import DelayedCommand, InjectableCommand
 from app.game.state.game_command import GameCommand
+from app.game.world import World
+from app.placement import EventLoopLoad, PlacementPolicy, least_games_policy
 
 
 class Message(BaseModel):
@@ -24,18 +34,51 @@ class Message(BaseModel):
     args: dict[str, Any]
 
 
-GameQueueMap = dict[int, Queue[ICommand]]
+@dataclass
+class Game:
+    """
+    Запущенная игра внутри ивент лупа
+    """
+
+    id: int
+    scope: Any
+    queue: Queue[ICommand]
+    command: GameCommand
+    quant: timedelta
+    tick: RepeatCommand
+
+
+GameMap = dict[int, Game]
 
 
 class Server:
-    def __init__(self, event_loop_count: int) -> None:
+    def __init__(
+        self,
+        event_loop_count: int,
+        placement_policy: PlacementPolicy = least_games_policy,
+    ) -> None:
         self._event_loop_count = event_loop_count
         self.event_loops: dict[int, EventLoop] = {}
+        self._event_loop_scopes: dict[int, Any] = {}
+        self._last_event_loop_id: int = -1
+        # Ивент лупы, из которых уводят игры перед остановкой
+        self._draining: set[int] = set()
+
+        self._placement_policy = placement_policy
+        # Таблица маршрутизации: игра -> ивент луп.
+        # Под этой же блокировкой команды кладутся в ивент лупы,
+        # чтобы смена маршрута при переносе игры не теряла команды.
+        self._routing: dict[int, int] = {}
+        self._routing_lock = threading.RLock()
+        # Игры в процессе переноса: команды, пришедшие за это время, ждут здесь
+        # и передаются игре в новом ивент лупе раньше всех следующих
+        self._migrating: dict[int, list[ICommand]] = {}
 
         self._last_game_id: int = -1
 
     def start(self) -> None:
         ioc_setup_exception_handler_store()
+        ioc_setup_systems()
 
         IoC[ICommand].resolve(
             "IoC.Scope.Register",
@@ -43,8 +86,64 @@ class Server:
             lambda: self,
         ).execute()
 
-        for i in range(self._event_loop_count):
-            self._create_and_start_event_loop(i)
+        for _ in range(self._event_loop_count):
+            self.add_event_loop()
+
+    def add_event_loop(self) -> int:
+        """
+        Запускает новый ивент луп, в который сразу можно размещать игры
+        """
+        with self._routing_lock:
+            self._last_event_loop_id += 1
+            event_loop_id = self._last_event_loop_id
+            self._create_and_start_event_loop(event_loop_id)
+        logger.info(f"Added event loop {event_loop_id}")
+        return event_loop_id
+
+    def drain_event_loop(self, event_loop_id: int) -> None:
+        """
+        Переносит все игры ивент лупа в остальные и мягко останавливает его.
+        Новые игры в ивент луп больше не размещаются.
+        """
+        with self._routing_lock:
+            if event_loop_id not in self._event_loop_ids() or event_loop_id in self._draining:
+                raise UnknownEventLoopError(event_loop_id)
+
+            loads = [
+                load for load in self.event_loop_loads() if load.event_loop_id != event_loop_id
+            ]
+            if not loads:
+                raise LastEventLoopError(event_loop_id)
+
+            logger.info(f"Draining event loop {event_loop_id}")
+            for game_id in self.game_ids(event_loop_id):
+                target_id = self._placement_policy(loads)
+                self.migrate_game(game_id, target_id)
+                # Учитываем перенесенную игру при выборе следующего ивент лупа
+                loads = [
+                    replace(load, games=load.games + 1) if load.event_loop_id == target_id else load
+                    for load in loads
+                ]
+
+            self._draining.add(event_loop_id)
+            self._stop_event_loop(event_loop_id)
+
+    def _stop_event_loop(self, event_loop_id: int) -> None:
+        """
+        Мягкая остановка выполняется после всех уже отправленных команд,
+        в том числе команд переноса игр
+        """
+        event_loop = self.event_loops[event_loop_id]
+
+        def remove() -> None:
+            with self._routing_lock:
+                del self.event_loops[event_loop_id]
+                del self._event_loop_scopes[event_loop_id]
+                self._draining.discard(event_loop_id)
+            logger.info(f"Event loop {event_loop_id} drained")
+
+        event_loop.add_after_hook(remove)
+        event_loop.put_command(SoftStopEventLoopCommand(event_loop))
 
     def _create_and_start_event_loop(self, loop_id: int) -> None:
         el_scope = IoC.resolve("IoC.Scope.Create", f"EventLoop {loop_id}")
@@ -53,12 +152,13 @@ class Server:
         ioc_setup_event_loop()
         event_loop = IoC[EventLoop].resolve("EventLoop")
         self.event_loops[loop_id] = event_loop
+        self._event_loop_scopes[loop_id] = el_scope
 
-        event_loop_game_queues: GameQueueMap = {}
+        event_loop_games: GameMap = {}
         IoC[ICommand].resolve(
             "IoC.Scope.Register",
-            "EventLoop.game_queues",
-            lambda: event_loop_game_queues,
+            "EventLoop.games",
+            lambda: event_loop_games,
         ).execute()
 
         IoC[ICommand].resolve("IoC.Scope.Current.Clear").execute()
@@ -66,35 +166,158 @@ class Server:
         RunEventLoopInThreadCommand(event_loop, el_scope).execute()
 
     def stop(self) -> None:
-        for event_loop in self.event_loops.values():
+        for event_loop in list(self.event_loops.values()):
             event_loop.put_command(HardStopEventLoopCommand(event_loop))
 
     def new_game(self) -> int:
-        self._last_game_id += 1
-        game_id = self._last_game_id
+        with self._routing_lock:
+            self._last_game_id += 1
+            game_id = self._last_game_id
 
-        event_loop_id = self._gameid_to_eventloopid(game_id)
-        event_loop = self.event_loops[event_loop_id]
-        logger.info(f"Assigning game {game_id} to event loop {event_loop_id}")
+            event_loop_id = self._placement_policy(self.event_loop_loads())
+            self._routing[game_id] = event_loop_id
+            logger.info(f"Assigning game {game_id} to event loop {event_loop_id}")
 
-        new_game_command = NewGameCommand(game_id)
-        event_loop.put_command(new_game_command)
+            self._put_command(event_loop_id, NewGameCommand(game_id))
 
         return game_id
 
     def receive_message(self, message: Message) -> None:
-        event_loop_id = self._gameid_to_eventloopid(message.game_id)
-        event_loop = self.event_loops[event_loop_id]
-
-        event_loop.put_command(
-            PutCommandToGameQueue(
-                game_id=message.game_id,
-                cmd=InterpretCommand(message),
+        """
+        Аргументы сообщения декодируются и проверяются здесь, в потоке эндпоинта,
+        а не в ивент лупе игры
+        """
+        self.put_game_command(message.game_id, InterpretCommand(message, _decode_args(message)))
+
+    def receive_messages(self, messages: list[Message]) -> None:
+        """
+        Пакет сообщений: команды группируются по ивент лупам, и каждый ивент луп
+        получает одну команду на весь пакет.
+        Если хотя бы одно сообщение некорректно или адресовано неизвестной игре,
+        не отправляется ни одно.
+        """
+        commands = [
+            (message.game_id, InterpretCommand(message, _decode_args(message)))
+            for message in messages
+        ]
+        with self._routing_lock:
+            groups: dict[int, list[tuple[int, ICommand]]] = {}
+            for game_id, cmd in commands:
+                event_loop_id = self._route(game_id)
+                if (pending := self._migrating.get(game_id)) is not None:
+                    pending.append(cmd)
+                else:
+                    groups.setdefault(event_loop_id, []).append((game_id, cmd))
+            for event_loop_id, group in groups.items():
+                self._put_command(event_loop_id, PutCommandsToGameQueues(group))
+
+    def put_game_command(self, game_id: int, cmd: ICommand) -> None:
+        """
+        Отправляет команду в очередь игры в том ивент лупе, где игра сейчас находится
+        """
+        with self._routing_lock:
+            event_loop_id = self._route(game_id)
+            if (pending := self._migrating.get(game_id)) is not None:
+                pending.append(cmd)
+                return
+            self._put_command(event_loop_id, PutCommandToGameQueue(game_id=game_id, cmd=cmd))
+
+    def migrate_game(self, game_id: int, target_event_loop_id: int) -> None:
+        """
+        Переносит запущенную игру в другой ивент луп между квантами.
+        Перенос выполняется исходным ивент лупом, маршрут меняется после переноса.
+        Команды игры, пришедшие во время переноса, выполняются в новом ивент лупе
+        в порядке поступления.
+        """
+        with self._routing_lock:
+            source_event_loop_id = self._route(game_id)
+            if source_event_loop_id == target_event_loop_id or game_id in self._migrating:
+                return
+            if not self._accepts_games(target_event_loop_id):
+                raise UnknownEventLoopError(target_event_loop_id)
+
+            logger.info(
+                f"Migrating game {game_id} from event loop {source_event_loop_id} "
+                f"to event loop {target_event_loop_id}"
             )
-        )
+            self._migrating[game_id] = []
+            self._put_command(
+                source_event_loop_id,
+                MigrateGameCommand(
+                    game_id=game_id,
+                    on_migrated=partial(self._adopt_game, game_id, target_event_loop_id),
+                ),
+            )
+
+    def _adopt_game(self, game_id: int, target_event_loop_id: int, game: Game | None) -> None:
+        """
+        Вызывается исходным ивент лупом, когда игра остановлена и убрана из него.
+        game - None, если игры в исходном ивент лупе не оказалось.
+        """
+        with self._routing_lock:
+            pending = self._migrating.pop(game_id)
+            if game is None:
+                for cmd in pending:
+                    self.put_game_command(game_id, cmd)
+                return
+
+            if not self._accepts_games(target_event_loop_id):
+                # Пока игра уходила, целевой ивент луп начали останавливать
+                target_event_loop_id = self._placement_policy(self.event_loop_loads())
+            IoC[ICommand].resolve(
+                "IoC.Scope.Parent.Set", game.scope, self._event_loop_scopes[target_event_loop_id]
+            ).execute()
+            self._put_command(target_event_loop_id, AdoptGameCommand(game, pending))
+            self._routing[game_id] = target_event_loop_id
+
+    def _accepts_games(self, event_loop_id: int) -> bool:
+        return event_loop_id in self._event_loop_ids() and event_loop_id not in self._draining
+
+    def has_game(self, game_id: int) -> bool:
+        with self._routing_lock:
+            return game_id in self._routing
+
+    def game_ids(self, event_loop_id: int) -> list[int]:
+        with self._routing_lock:
+            return [
+                game_id
+                for game_id, game_event_loop_id in self._routing.items()
+                if game_event_loop_id == event_loop_id
+            ]
+
+    def _put_command(self, event_loop_id: int, cmd: ICommand) -> None:
+        self.event_loops[event_loop_id].put_command(cmd)
+
+    def _route(self, game_id: int) -> int:
+        try:
+            return self._routing[game_id]
+        except KeyError:
+            raise UnknownGameError(game_id) from None
+
+    def event_loop_loads(self) -> list[EventLoopLoad]:
+        """
+        Нагрузка ивент лупов, доступных для размещения игр (без останавливаемых)
+        """
+        with self._routing_lock:
+            games = Counter(self._routing.values())
+            return [
+                self._event_loop_load(event_loop_id, games[event_loop_id])
+                for event_loop_id in self._event_loop_ids()
+                if event_loop_id not in self._draining
+            ]
 
-    def _gameid_to_eventloopid(self, game_id: int) -> int:
-        return game_id % self._event_loop_count
+    def _event_loop_ids(self) -> list[int]:
+        return list(self.event_loops)
+
+    def _event_loop_load(self, event_loop_id: int, games: int) -> EventLoopLoad:
+        event_loop = self.event_loops[event_loop_id]
+        return EventLoopLoad(
+            event_loop_id=event_loop_id,
+            games=games,
+            queue_depth=event_loop.queue_depth,
+            tick_time=event_loop.last_batch_time,
+            lag=event_loop.lag,
+        )
 
 
 class NewGameCommand(ICommand):
@@ -108,42 +331,54 @@ class NewGameCommand(ICommand):
         scope = IoC.resolve("IoC.Scope.Create", f"Game {self._game_id}")
         event_loop = IoC[EventLoop].resolve("EventLoop")
         game_queue = Queue()
+        # Состояние объектов игры в виде массивов, Game.items ссылаются на него по индексу
+        world = World()
+        game_items = ObjectRegistry(world)
 
         def init() -> None:
-            game_items = {}
             IoC[ICommand].resolve(
                 "IoC.Scope.Register",
                 "Game.items",
                 lambda: game_items,
             ).execute()
+            IoC[ICommand].resolve(
+                "IoC.Scope.Register",
+                "Game.world",
+                lambda: world,
+            ).execute()
             IoC[ICommand].resolve(
                 "IoC.Scope.Register",
                 "Game.Queue",
                 lambda: game_queue,
             ).execute()
 
+        # Игра не блокирует ивент луп: за квант выполняет накопившиеся команды,
+        # а следующий квант планируется по времени
+        quant = timedelta(seconds=0.5)
         game_command = GameCommand(
             id_=self._game_id,
             queue=game_queue,
-            quant=timedelta(seconds=0.5),
+            quant=quant,
             scope=scope,
             init=init,
+            blocking=False,
+            # Системы раз в квант обновляют все объекты игры разом
+            systems=IoC[ICommand].resolve("Game.Systems", world),
         )
-
-        injectable_delayed_command = InjectableCommand()
-        repeating_game_command = MacroCommand(
-            [
-                game_command,
-                injectable_delayed_command,
-            ]
-        )
-        injectable_delayed_command.set_cmd(DelayedCommand(repeating_game_command))
+        repeating_game_command = RepeatCommand(game_command, quant)
 
         event_loop.put_command(repeating_game_command)
 
         # Регистрируем игру в словаре игр ивент лупа
-        game_queues = IoC[GameQueueMap].resolve("EventLoop.game_queues")
-        game_queues[self._game_id] = game_queue
+        games = IoC[GameMap].resolve("EventLoop.games")
+        games[self._game_id] = Game(
+            id=self._game_id,
+            scope=scope,
+            queue=game_queue,
+            command=game_command,
+            quant=quant,
+            tick=repeating_game_command,
+        )
 
 
 class PutCommandToGameQueue(ICommand):
@@ -159,18 +394,120 @@ class PutCommandToGameQueue(ICommand):
     @override
     def execute(self) -> None:
         logger.debug(f"Sending command {self._cmd} to game {self._game_id}")
-        game_queues = IoC[GameQueueMap].resolve("EventLoop.game_queues")
-        game_queues[self._game_id].put(self._cmd)
+        games = IoC[GameMap].resolve("EventLoop.games")
+        if game := games.get(self._game_id):
+            game.queue.put(self._cmd)
+            return
+
+        # Игра переехала в другой ивент луп, пока команда ждала в очереди
+        IoC[Server].resolve("Server").put_game_command(self._game_id, self._cmd)
+
+
+class PutCommandsToGameQueues(ICommand):
+    """
+    Пакет команд для игр одного ивент лупа: (id игры, команда)
+    """
+
+    def __init__(self, commands: list[tuple[int, ICommand]]) -> None:
+        self._commands = commands
+
+    @override
+    def execute(self) -> None:
+        for game_id, cmd in self._commands:
+            PutCommandToGameQueue(game_id=game_id, cmd=cmd).execute()
+
+
+class MigrateGameCommand(ICommand):
+    """
+    Выполняется в исходном ивент лупе игры: останавливает ее кванты, убирает игру
+    из ивент лупа и отдает ее серверу (on_migrated), который передает ее в новый ивент луп.
+    Очередь игры переезжает вместе с ней, накопившиеся команды не теряются.
+    """
+
+    def __init__(self, game_id: int, on_migrated: Callable[[Game | None], None]) -> None:
+        self._game_id = game_id
+        self._on_migrated = on_migrated
+
+    @override
+    def execute(self) -> None:
+        games = IoC[GameMap].resolve("EventLoop.games")
+        game = games.pop(self._game_id, None)
+        if not game:
+            logger.warning(f"Game {self._game_id} is not in this event loop, skipping migration")
+        else:
+            game.tick.cancel()
+        self._on_migrated(game)
+
+
+class AdoptGameCommand(ICommand):
+    """
+    Выполняется в новом ивент лупе игры: регистрирует игру, ставит в ее очередь команды,
+    пришедшие во время переноса, и возобновляет ее кванты
+    """
+
+    def __init__(self, game: Game, pending: list[ICommand]) -> None:
+        self._game = game
+        self._pending = pending
+
+    @override
+    def execute(self) -> None:
+        game = self._game
+        logger.info(f"Adopting game {game.id}")
+
+        games = IoC[GameMap].resolve("EventLoop.games")
+        games[game.id] = game
+        for cmd in self._pending:
+            game.queue.put(cmd)
+
+        game.tick = RepeatCommand(game.command, game.quant)
+        event_loop = IoC[EventLoop].resolve("EventLoop")
+        event_loop.schedule_after(game.tick, game.quant, keep_alive=False)
+
+
+def _decode_args(message: Message) -> Any:
+    """
+    Аргументы сообщения, декодированные MessageDecoder.<op_id>.
+    None, если для операции декодер не зарегистрирован: обработчик получит только сообщение.
+    """
+    dependency = f"MessageDecoder.{message.op_id}"
+    if not IoC[bool].resolve("IoC.Registered", dependency):
+        return None
+    decode = IoC[Resolver[Any]].resolve("IoC.Resolver", dependency)
+    try:
+        return decode(message.args)
+    except ValidationError as e:
+        raise InvalidMessageError(message.op_id, e) from e
 
 
 class InterpretCommand(ICommand):
-    def __init__(self, message: Message) -> None:
+    def __init__(self, message: Message, args: Any = None) -> None:
         self._message = message
+        self._args = args
 
     @override
     def execute(self) -> None:
-        handler_command = IoC[ICommand].resolve(
-            f"MessageHandler.{self._message.op_id}",
-            self._message,
-        )
-        handler_command.execute()
+        handler = IoC[Action].resolve("IoC.Resolver", f"MessageHandler.{self._message.op_id}")
+        if self._args is None:
+            handler(self._message)
+        else:
+            handler(self._message, self._args)
+
+
+class UnknownGameError(Exception):
+    def __init__(self, game_id: int) -> None:
+        super().__init__(f"Game {game_id} does not exist")
+
+
+class InvalidMessageError(Exception):
+    def __init__(self, op_id: str, error: ValidationError) -> None:
+        super().__init__(f"Invalid args for '{op_id}': {error}")
+
+
+class UnknownEventLoopError(Exception):
+    def __init__(self, event_loop_id: int) -> None:
+        super().__init__(f"Event loop {event_loop_id} does not exist or is draining")
+
+
+class LastEventLoopError(Exception):
+    def __init__(self, event_loop_id: int) -> None:
+        super().__init__(f"Event loop {event_loop_id} is the last one and cannot be drained")
@@ -0,0 +1,158 @@
+import multiprocessing
+import threading
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import override
+
+from loguru import logger
+
+from app.core.command import ICommand
+from app.placement import EventLoopLoad, PlacementPolicy, least_games_policy
+from app.server import Server
+
+SetupFunc = Callable[[], None]
+
+SHARD_STOP_TIMEOUT = 5.0
+
+
+class EventLoopShard:
+    """
+    Ивент луп в отдельном процессе.
+    Команды сериализуются pickle и передаются через однонаправленный pipe,
+    поэтому все передаваемые команды (и их аргументы) должны быть picklable.
+    """
+
+    def __init__(self, shard_id: int, setup: SetupFunc) -> None:
+        self._shard_id = shard_id
+
+        # spawn, а не fork: родительский процесс многопоточный (ивент лупы, uvicorn)
+        context = multiprocessing.get_context("spawn")
+        receiver, self._sender = context.Pipe(duplex=False)
+        self._send_lock = threading.Lock()
+        self._process = context.Process(
+            target=_run_shard,
+            args=(shard_id, receiver, setup),
+            name=f"EventLoopShard {shard_id}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._process.start()
+
+    def put_command(self, cmd: ICommand) -> None:
+        with self._send_lock:
+            self._sender.send(cmd)
+
+    def stop(self) -> None:
+        with self._send_lock:
+            self._sender.send(None)
+        self._process.join(SHARD_STOP_TIMEOUT)
+        if self._process.is_alive():
+            logger.warning(f"Shard {self._shard_id} did not stop in time, terminating")
+            self._process.terminate()
+
+
+def _run_shard(shard_id: int, receiver: Connection, setup: SetupFunc) -> None:
+    """
+    Точка входа процесса шарда: настраивает IoC, поднимает один ивент луп
+    и перекладывает в него команды из pipe до получения None
+    """
+    setup()
+
+    server = Server(event_loop_count=1)
+    server.start()
+    event_loop = server.event_loops[0]
+    stopped = threading.Event()
+    event_loop.add_after_hook(stopped.set)
+    logger.info(f"Shard {shard_id} started")
+
+    while True:
+        try:
+            cmd = receiver.recv()
+        except EOFError:
+            break
+        if cmd is None:
+            break
+        event_loop.put_command(cmd)
+
+    server.stop()
+    stopped.wait()
+    logger.info(f"Shard {shard_id} stopped")
+
+
+class ShardedServer(Server):
+    """
+    Сервер, у которого каждый ивент луп работает в своем процессе (шарде),
+    чтобы игры разных шардов выполнялись параллельно, без общего GIL.
+    Игры целиком живут внутри своего шарда, сервер только пересылает им команды.
+    setup выполняется в каждом шарде и должен настроить IoC (адаптеры, обработчики
+    сообщений); функция должна быть доступна для импорта по имени.
+    """
+
+    def __init__(
+        self,
+        event_loop_count: int,
+        setup: SetupFunc,
+        placement_policy: PlacementPolicy = least_games_policy,
+    ) -> None:
+        super().__init__(event_loop_count, placement_policy)
+        self._setup = setup
+        self.shards: dict[int, EventLoopShard] = {}
+        # Убранные из маршрутизации шарды, процесс которых еще не остановлен
+        self._stopping: dict[int, EventLoopShard] = {}
+
+    @override
+    def _create_and_start_event_loop(self, loop_id: int) -> None:
+        shard = EventLoopShard(loop_id, self._setup)
+        shard.start()
+        self.shards[loop_id] = shard
+
+    @override
+    def _put_command(self, event_loop_id: int, cmd: ICommand) -> None:
+        self.shards[event_loop_id].put_command(cmd)
+
+    @override
+    def _event_loop_ids(self) -> list[int]:
+        return list(self.shards)
+
+    @override
+    def _event_loop_load(self, event_loop_id: int, games: int) -> EventLoopLoad:
+        # Очередь и время кванта шарда из родительского процесса не видны
+        return EventLoopLoad(event_loop_id=event_loop_id, games=games)
+
+    @override
+    def migrate_game(self, game_id: int, target_event_loop_id: int) -> None:
+        # Скоуп и очередь игры живут в памяти процесса шарда и не переносятся между процессами
+        msg = "Games cannot be migrated between processes"
+        raise UnsupportedOperationError(msg)
+
+    @override
+    def drain_event_loop(self, event_loop_id: int) -> None:
+        """
+        Останавливает шард без игр. Игры между процессами не переносятся,
+        поэтому шард с играми не трогается.
+        """
+        with self._routing_lock:
+            if self.game_ids(event_loop_id):
+                msg = f"Shard {event_loop_id} has games, which cannot be migrated between processes"
+                raise UnsupportedOperationError(msg)
+            super().drain_event_loop(event_loop_id)
+            shard = self._stopping.pop(event_loop_id)
+        # Процесс останавливается после снятия блокировки: join ждет до SHARD_STOP_TIMEOUT,
+        # а маршрутизация сообщений остальных игр ждать не должна
+        shard.stop()
+
+    @override
+    def _stop_event_loop(self, event_loop_id: int) -> None:
+        # Игр в шарде нет (см. drain_event_loop). Под блокировкой шард только убирается
+        # из маршрутизации, сам процесс останавливает drain_event_loop
+        self._stopping[event_loop_id] = self.shards.pop(event_loop_id)
+        self._draining.discard(event_loop_id)
+
+    @override
+    def stop(self) -> None:
+        for shard in self.shards.values():
+            shard.stop()
+
+
+class UnsupportedOperationError(Exception): ...
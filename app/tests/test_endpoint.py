@@ -1,15 +1,18 @@
 import threading
 from collections.abc import Iterator
+from dataclasses import dataclass
 
 import pytest
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
 
 from app import endpoint
-from app.core.command import ICommand, LambdaCommand
+from app.core.command import ICommand
 from app.core.ioc import IoC
 from app.core.ioc_scoped import Scope
 from app.game.setup.adapters import ioc_setup_adapters
 from app.server import Message, Server
+from codegen.decoder import build_decoder
 
 
 @pytest.fixture(autouse=True)
@@ -36,6 +39,9 @@ def server() -> Iterator[Server]:
 
 endpoint_client = TestClient(endpoint.app)
 
+# Сколько ждать, пока ивент луп обработает отправленные сообщения
+HANDLED_TIMEOUT = 10
+
 
 def test_endpoint(server: Server) -> None:
     del server
@@ -55,7 +61,7 @@ def test_endpoint(server: Server) -> None:
     IoC[ICommand].resolve(
         "IoC.Scope.Register",
         "MessageHandler.test_op",
-        LambdaCommand(handle_test_op).setup,
+        handle_test_op,
     ).execute()
 
     response = endpoint_client.post(
@@ -82,3 +88,120 @@ def test_endpoint(server: Server) -> None:
 
     for event in events:
         event.wait()
+
+
+def test_endpoint_unknown_game(server: Server) -> None:
+    del server
+
+    response = endpoint_client.post(
+        "/message",
+        json={
+            "game_id": 100,
+            "object_id": 0,
+            "op_id": "test_op",
+            "args": {},
+        },
+    )
+    assert response.status_code == 404
+
+
+@dataclass(frozen=True, slots=True)
+class TypedArgs:
+    x: int
+
+
+def test_endpoint_decodes_args(server: Server) -> None:
+    del server
+
+    endpoint_client.post("/game")
+    received = []
+    event = threading.Event()
+
+    def handle_typed_op(message: Message, args: TypedArgs) -> None:
+        del message
+        received.append(args)
+        event.set()
+
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "MessageHandler.typed_op", handle_typed_op
+    ).execute()
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "MessageDecoder.typed_op", build_decoder(handle_typed_op)
+    ).execute()
+
+    message = {"game_id": 0, "object_id": 0, "op_id": "typed_op"}
+    response = endpoint_client.post("/message", json={**message, "args": {"x": "not a number"}})
+    assert response.status_code == 422
+
+    response = endpoint_client.post("/message", json={**message, "args": {"x": "5"}})
+    assert response.status_code == 200
+    assert event.wait(timeout=HANDLED_TIMEOUT)
+    assert received == [TypedArgs(x=5)]
+
+
+def test_endpoint_messages(server: Server) -> None:
+    del server
+
+    endpoint_client.post("/game")
+    endpoint_client.post("/game")
+    received: list[tuple[int, int]] = []
+    done = threading.Event()
+
+    def handle_batch_op(message: Message) -> None:
+        received.append((message.game_id, message.object_id))
+        if len(received) == 3:
+            done.set()
+
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register", "MessageHandler.batch_op", handle_batch_op
+    ).execute()
+
+    def message(game_id: int, object_id: int) -> dict[str, object]:
+        return {"game_id": game_id, "object_id": object_id, "op_id": "batch_op", "args": {}}
+
+    # Неизвестная игра в пакете: не отправляется ни одно сообщение
+    response = endpoint_client.post("/messages", json=[message(0, 0), message(100, 0)])
+    assert response.status_code == 404
+
+    response = endpoint_client.post("/messages", json=[message(0, 1), message(1, 2), message(0, 3)])
+    assert response.status_code == 200
+    assert done.wait(timeout=HANDLED_TIMEOUT)
+    assert sorted(received) == [(0, 1), (0, 3), (1, 2)]
+
+
+def test_game_websocket(server: Server) -> None:
+    del server
+
+    game_id = endpoint_client.post("/game").json()
+    received: list[int] = []
+    done = threading.Event()
+
+    def handle_ws_op(message: Message) -> None:
+        assert message.game_id == game_id
+        received.append(message.object_id)
+        if len(received) == 3:
+            done.set()
+
+    IoC[ICommand].resolve("IoC.Scope.Register", "MessageHandler.ws_op", handle_ws_op).execute()
+
+    with endpoint_client.websocket_connect(f"/game/{game_id}/ws") as websocket:
+        websocket.send_json({"object_id": 1, "op_id": "ws_op", "args": {}})
+        assert websocket.receive_json() == {"ack": 1}
+        websocket.send_json(
+            [
+                {"object_id": 2, "op_id": "ws_op", "args": {}},
+                {"object_id": 3, "op_id": "ws_op", "args": {}},
+            ]
+        )
+        assert websocket.receive_json() == {"ack": 2}
+        websocket.send_json({"op_id": "ws_op"})
+        assert "error" in websocket.receive_json()
+
+    assert done.wait(timeout=HANDLED_TIMEOUT)
+    assert received == [1, 2, 3]
+
+    with (
+        pytest.raises(WebSocketDisconnect),
+        endpoint_client.websocket_connect("/game/100/ws") as websocket,
+    ):
+        websocket.receive_json()
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.game.state.event_loop import EventLoop
+from app.placement import (
+    EventLoopLoad,
+    least_games_policy,
+    least_queue_depth_policy,
+    least_tick_time_policy,
+)
+from app.server import (
+    LastEventLoopError,
+    Message,
+    Server,
+    UnknownEventLoopError,
+    UnknownGameError,
+)
+
+LOADS = [
+    EventLoopLoad(event_loop_id=0, games=1, queue_depth=10, tick_time=0.001),
+    EventLoopLoad(event_loop_id=1, games=3, queue_depth=0, tick_time=0.010),
+    EventLoopLoad(event_loop_id=2, games=2, queue_depth=5, tick_time=0.0001),
+]
+
+
+def test_policies() -> None:
+    assert least_games_policy(LOADS) == 0
+    assert least_queue_depth_policy(LOADS) == 1
+    assert least_tick_time_policy(LOADS) == 2
+
+
+def test_policy_tie_break() -> None:
+    loads = [EventLoopLoad(event_loop_id=i, games=0) for i in (2, 0, 1)]
+    assert least_games_policy(loads) == 0
+    assert least_queue_depth_policy(loads) == 0
+    assert least_tick_time_policy(loads) == 0
+
+
+def test_server_routing() -> None:
+    placed: list[int] = []
+
+    def policy(loads: list[EventLoopLoad]) -> int:
+        event_loop_id = least_games_policy(loads)
+        placed.append(event_loop_id)
+        return event_loop_id
+
+    server = Server(event_loop_count=3, placement_policy=policy)
+    server.start()
+    try:
+        for _ in range(6):
+            server.new_game()
+        assert placed == [0, 1, 2, 0, 1, 2]
+        assert [load.games for load in server.event_loop_loads()] == [2, 2, 2]
+
+        with pytest.raises(UnknownGameError):
+            server.receive_message(Message(game_id=100, object_id=0, op_id="test", args={}))
+    finally:
+        server.stop()
+
+
+def test_resize_event_loop_pool() -> None:
+    server = Server(event_loop_count=1)
+    server.start()
+    handled = threading.Event()
+    event_loops: list[EventLoop] = []
+
+    def handle(_: Message) -> None:
+        event_loops.append(IoC[EventLoop].resolve("EventLoop"))
+        handled.set()
+
+    IoC[ICommand].resolve("IoC.Scope.Register", "MessageHandler.resize_test", handle).execute()
+    try:
+        first_game_id = server.new_game()
+        new_event_loop_id = server.add_event_loop()
+        assert new_event_loop_id == 1
+        # Новый ивент луп сразу участвует в размещении
+        assert server.new_game() in server.game_ids(new_event_loop_id)
+
+        server.drain_event_loop(0)
+        server.receive_message(
+            Message(game_id=first_game_id, object_id=0, op_id="resize_test", args={})
+        )
+        assert handled.wait(5)
+        assert event_loops == [server.event_loops[new_event_loop_id]]
+
+        deadline = time.monotonic() + 5
+        while 0 in server.event_loops and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert list(server.event_loops) == [new_event_loop_id]
+        assert [load.games for load in server.event_loop_loads()] == [2]
+
+        with pytest.raises(UnknownEventLoopError):
+            server.drain_event_loop(0)
+        with pytest.raises(LastEventLoopError):
+            server.drain_event_loop(new_event_loop_id)
+    finally:
+        server.stop()
@@ -0,0 +1,106 @@
+import threading
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.game.state.event_loop import EventLoop
+from app.placement import EventLoopLoad
+from app.rebalancer import Rebalancer
+from app.server import Message, Server, UnknownEventLoopError
+
+MESSAGES = 50
+
+
+def test_migrate_game() -> None:
+    server = Server(event_loop_count=2)
+    server.start()
+    handled = threading.Event()
+    event_loops: list[EventLoop] = []
+
+    def handle(_: Message) -> None:
+        event_loops.append(IoC[EventLoop].resolve("EventLoop"))
+        handled.set()
+
+    IoC[ICommand].resolve("IoC.Scope.Register", "MessageHandler.migrate_test", handle).execute()
+    try:
+        game_id = server.new_game()
+        assert server.game_ids(0) == [game_id]
+
+        server.migrate_game(game_id, 1)
+        server.receive_message(Message(game_id=game_id, object_id=0, op_id="migrate_test", args={}))
+        assert handled.wait(5)
+
+        # Игра продолжает квантоваться уже в новом ивент лупе
+        assert event_loops == [server.event_loops[1]]
+        assert server.game_ids(0) == []
+        assert server.game_ids(1) == [game_id]
+    finally:
+        server.stop()
+
+
+def test_migrate_game_keeps_order() -> None:
+    server = Server(event_loop_count=3)
+    server.start()
+    received: list[int] = []
+    done = threading.Event()
+
+    def handle(message: Message) -> None:
+        received.append(message.object_id)
+        if len(received) == MESSAGES:
+            done.set()
+
+    IoC[ICommand].resolve("IoC.Scope.Register", "MessageHandler.order_test", handle).execute()
+    try:
+        game_id = server.new_game()
+        assert server.game_ids(0) == [game_id]
+
+        # В останавливаемый ивент луп игры не переносятся
+        server.drain_event_loop(1)
+        with pytest.raises(UnknownEventLoopError):
+            server.migrate_game(game_id, 1)
+
+        # Сообщения, отправленные во время переноса, выполняются по порядку
+        server.migrate_game(game_id, 2)
+        for object_id in range(MESSAGES):
+            server.receive_message(
+                Message(game_id=game_id, object_id=object_id, op_id="order_test", args={})
+            )
+        assert done.wait(5)
+        assert received == list(range(MESSAGES))
+        assert server.game_ids(2) == [game_id]
+    finally:
+        server.stop()
+
+
+def test_rebalance() -> None:
+    server = Mock(spec=Server)
+    server.game_ids.return_value = [0, 3]
+    rebalancer = Rebalancer(server, lag_threshold=timedelta(milliseconds=50))
+
+    server.event_loop_loads.return_value = [
+        EventLoopLoad(event_loop_id=0, games=2, lag=0.2),
+        EventLoopLoad(event_loop_id=1, games=1, lag=0.01),
+        EventLoopLoad(event_loop_id=2, games=5, lag=0.1),
+    ]
+    assert rebalancer.rebalance()
+    server.game_ids.assert_called_once_with(0)
+    server.migrate_game.assert_called_once_with(3, 1)
+
+    # Разница отставаний меньше порога
+    server.migrate_game.reset_mock()
+    server.event_loop_loads.return_value = [
+        EventLoopLoad(event_loop_id=0, games=2, lag=0.03),
+        EventLoopLoad(event_loop_id=1, games=1, lag=0.0),
+    ]
+    assert not rebalancer.rebalance()
+
+    # Единственную игру не переносим
+    server.event_loop_loads.return_value = [
+        EventLoopLoad(event_loop_id=0, games=1, lag=1.0),
+        EventLoopLoad(event_loop_id=1, games=1, lag=0.0),
+    ]
+    assert not rebalancer.rebalance()
+    server.migrate_game.assert_not_called()
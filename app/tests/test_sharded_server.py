@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing.queues import Queue
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.core import ioc_scoped
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.core.ioc_scoped import Scope
+from app.server import Message
+from app.sharded_server import ShardedServer, UnsupportedOperationError
+
+RESULT_TIMEOUT = 30
+
+
+def _ioc_setup_shard(results: Queue) -> None:
+    """
+    Выполняется в процессе шарда
+    """
+    ioc_scoped.setup()
+
+    def handle_test_op(message: Message) -> None:
+        scope = IoC[Scope].resolve("IoC.Scope.Current")
+        results.put((message.game_id, scope.name, os.getpid()))
+
+    IoC[ICommand].resolve(
+        "IoC.Scope.Register",
+        "MessageHandler.test_op",
+        handle_test_op,
+    ).execute()
+
+
+def test_sharded_server() -> None:
+    results = multiprocessing.get_context("spawn").Queue()
+    server = ShardedServer(event_loop_count=2, setup=partial(_ioc_setup_shard, results))
+    server.start()
+
+    try:
+        game_ids = [server.new_game(), server.new_game()]
+        for game_id in game_ids:
+            server.receive_message(Message(game_id=game_id, object_id=0, op_id="test_op", args={}))
+
+        received = sorted(results.get(timeout=RESULT_TIMEOUT) for _ in game_ids)
+    finally:
+        server.stop()
+
+    assert [(game_id, scope_name) for game_id, scope_name, _ in received] == [
+        (0, "Game 0"),
+        (1, "Game 1"),
+    ]
+    pids = {pid for _, _, pid in received}
+    assert len(pids) == 2
+    assert os.getpid() not in pids
+
+
+def test_drain_shard(mocker: MockerFixture) -> None:
+    results = multiprocessing.get_context("spawn").Queue()
+    server = ShardedServer(event_loop_count=2, setup=partial(_ioc_setup_shard, results))
+    server.start()
+
+    try:
+        game_id = server.new_game()
+        busy, idle = sorted(server.shards, key=lambda shard_id: not server.game_ids(shard_id))
+
+        # Игры не переносятся между процессами: шард с игрой не останавливается
+        with pytest.raises(UnsupportedOperationError):
+            server.migrate_game(game_id, idle)
+        with pytest.raises(UnsupportedOperationError):
+            server.drain_event_loop(busy)
+        assert set(server.shards) == {busy, idle}
+
+        shard = server.shards[idle]
+        stop = shard.stop
+
+        def stop_unlocked() -> None:
+            # Пока процесс шарда останавливается, другие потоки маршрутизируют сообщения
+            with ThreadPoolExecutor(1) as pool:
+                assert pool.submit(server.has_game, game_id).result(timeout=RESULT_TIMEOUT)
+            stop()
+
+        stop_mock = mocker.patch.object(shard, "stop", side_effect=stop_unlocked)
+        server.drain_event_loop(idle)
+        assert list(server.shards) == [busy]
+        stop_mock.assert_called_once()
+    finally:
+        server.stop()
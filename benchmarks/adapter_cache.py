@@ -0,0 +1,87 @@
+"""
+Выделение памяти и время обработки сообщения move с кешем адаптеров объекта и без него.
+
+Запуск: python -m benchmarks.adapter_cache
+"""
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any, override
+
+from loguru import logger
+
+from app.core import ioc_scoped
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.game.registry import ObjectRegistry
+from app.game.setup import message_handlers
+from app.game.setup.adapters import ioc_setup_adapters
+from app.game.world import World, WorldObject
+from app.server import Message
+
+MESSAGES = 1000
+NUMBER = 100_000
+
+
+class _UncachedWorldObject(WorldObject):
+    """
+    Объект, который не кеширует адаптеры: каждое сообщение создает их заново
+    """
+
+    __slots__ = ()
+
+    @override
+    def get_adapters(self) -> None:
+        return None
+
+
+def _measure_peak(handle: Callable[[Message, Any], None], message: Message, args: Any) -> float:
+    """
+    Сколько байт в пике выделяет обработка одного сообщения
+    """
+    handle(message, args)
+    tracemalloc.start()
+    total = 0
+    for _ in range(MESSAGES):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        handle(message, args)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    return total / MESSAGES
+
+
+def main() -> None:
+    logger.remove()
+    ioc_scoped.setup()
+    ioc_setup_adapters()
+    message_handlers.ioc_setup_move()
+
+    game_scope = IoC.resolve("IoC.Scope.Create", "Game")
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", game_scope).execute()
+    world = World()
+    items = ObjectRegistry(world)
+    IoC[ICommand].resolve("IoC.Scope.Register", "Game.items", lambda: items).execute()
+    IoC[ICommand].resolve("IoC.Scope.Register", "Game.world", lambda: world).execute()
+
+    cached = world.create(1)
+    uncached = _UncachedWorldObject(world, world.create(2).index)
+    items[1], items[2] = cached, uncached
+
+    def handle(message: Message, args: Any) -> None:
+        IoC.resolve(f"MessageHandler.{message.op_id}", message, args)
+
+    # Аргументы декодируются один раз, измеряется только обработчик
+    raw_args = {"x": 1, "y": 2, "velocity_x": 3, "velocity_y": 4}
+    args = IoC.resolve("MessageDecoder.move", raw_args)
+    for name, object_id in (("Without cache", 2), ("With cache", 1)):
+        message = Message(game_id=0, object_id=object_id, op_id="move", args=raw_args)
+        peak = _measure_peak(handle, message, args)
+        seconds = min(timeit.repeat(lambda m=message: handle(m, args), number=NUMBER, repeat=3))
+        print(f"{name:>14}: {peak:7.0f} B/message, {seconds / NUMBER * 1e6:6.2f} us/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Пропускная способность одного ивент лупа (команд в секунду).
+
+Запуск: python -m benchmarks.event_loop_throughput
+"""
+
+import threading
+import time
+from typing import override
+
+from app.core.command import ICommand
+from app.core.exception_handler_store import ExceptionHandlerStore
+from app.game.state.event_loop import EventLoop, HardStopEventLoopCommand
+
+NUMBER = 200_000
+PRODUCERS = 4
+
+
+class NoOpCommand(ICommand):
+    @override
+    def execute(self) -> None:
+        pass
+
+
+def bench_prefilled() -> float:
+    """
+    Все команды уже в очереди, луп выполняет их до опустошения
+    """
+    event_loop = EventLoop(ExceptionHandlerStore())
+    cmd = NoOpCommand()
+    for _ in range(NUMBER):
+        event_loop.put_command(cmd)
+
+    start = time.perf_counter()
+    event_loop.run_until_complete()
+    return NUMBER / (time.perf_counter() - start)
+
+
+def bench_producers() -> float:
+    """
+    Команды кладут несколько потоков, пока луп работает в своем
+    """
+    event_loop = EventLoop(ExceptionHandlerStore())
+    done = threading.Event()
+    event_loop.add_after_hook(done.set)
+    thread = threading.Thread(target=event_loop.run_forever)
+    thread.start()
+
+    cmd = NoOpCommand()
+
+    def produce() -> None:
+        for _ in range(NUMBER // PRODUCERS):
+            event_loop.put_command(cmd)
+
+    start = time.perf_counter()
+    producers = [threading.Thread(target=produce) for _ in range(PRODUCERS)]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    event_loop.put_command(HardStopEventLoopCommand(event_loop))
+    done.wait()
+    elapsed = time.perf_counter() - start
+
+    thread.join()
+    return NUMBER / elapsed
+
+
+def main() -> None:
+    print(f"{'prefilled':>12}: {bench_prefilled():12,.0f} cmd/s")
+    print(f"{f'{PRODUCERS} producers':>12}: {bench_producers():12,.0f} cmd/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Поиск попаданий торпед по сетке (HitDetectionCommand) и перебором всех пар торпеда-цель.
+
+Запуск: python -m benchmarks.hit_detection
+"""
+
+import random
+import time
+
+import numpy as np
+from loguru import logger
+
+from app.game.behaviour.collision import HitDetectionCommand
+from app.game.behaviour.systems import MOVE, MoveSystemCommand
+from app.game.spatial import SpatialGrid
+from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+SHIPS = 2000
+TORPEDOES = 5000
+FIELD = 20_000
+TICKS = 10
+
+
+def _make_world(seed: int) -> World:
+    rng = random.Random(seed)
+    world = World()
+    for _ in range(SHIPS):
+        ship = world.create()
+        ship.set_property("movable_position", Vector(rng.randrange(FIELD), rng.randrange(FIELD)))
+        ship.set_property("collision_radius", 10)
+    for _ in range(TORPEDOES):
+        torpedo = world.create()
+        torpedo.set_property("movable_position", Vector(rng.randrange(FIELD), rng.randrange(FIELD)))
+        torpedo.set_property("movable_angle", Angle(rng.randrange(72)))
+        torpedo.set_property("movable_abs_velocity", 40)
+        torpedo.set_property("projectile", value=True)
+    return world
+
+
+def _all_pairs_hits(world: World, start: np.ndarray) -> int:
+    """
+    Та же геометрия, но кандидаты - все цели для каждой торпеды
+    """
+    projectiles = np.flatnonzero(world.projectile & ~world.disabled)
+    targets = np.flatnonzero(world.mask("collision_radius") & ~world.projectile & ~world.disabled)
+    centers = world.position[targets].astype(np.float64)
+    radius2 = world.collision_radius[targets] ** 2
+    hits = 0
+    for chunk in np.array_split(projectiles, max(1, len(projectiles) // 256)):
+        a = start[chunk].astype(np.float64)[:, None, :]
+        direction = (world.position[chunk] - start[chunk]).astype(np.float64)[:, None, :]
+        length2 = np.maximum((direction**2).sum(axis=2), 1e-12)
+        t = np.clip(((centers - a) * direction).sum(axis=2) / length2, 0, 1)
+        closest = a + t[:, :, None] * direction
+        hits += int((((centers - closest) ** 2).sum(axis=2) <= radius2).any(axis=1).sum())
+    return hits
+
+
+def main() -> None:
+    logger.remove()
+
+    world = _make_world(1)
+    grid = SpatialGrid(world, cell_size=256)
+    move, detect = MoveSystemCommand(world), HitDetectionCommand(world, grid)
+    elapsed = 0.0
+    for _ in range(TICKS):
+        world.request(np.flatnonzero(world.used), MOVE)
+        move.execute()
+        begin = time.perf_counter()
+        detect.execute()
+        elapsed += time.perf_counter() - begin
+    disabled = int(world.disabled.sum())
+    print(f"{'SpatialGrid':>12}: {elapsed / TICKS * 1e3:8.2f} ms/tick, {disabled} disabled")
+
+    world = _make_world(1)
+    move = MoveSystemCommand(world)
+    elapsed = 0.0
+    hits = 0
+    for _ in range(TICKS):
+        start = world.position.copy()
+        world.request(np.flatnonzero(world.used), MOVE)
+        move.execute()
+        begin = time.perf_counter()
+        hits += _all_pairs_hits(world, start)
+        elapsed += time.perf_counter() - begin
+    print(f"{'All pairs':>12}: {elapsed / TICKS * 1e3:8.2f} ms/tick, {hits} hits (no disabling)")
+    print(f"{SHIPS} ships, {TORPEDOES} torpedoes")
+
+
+if __name__ == "__main__":
+    main()
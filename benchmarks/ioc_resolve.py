@@ -0,0 +1,62 @@
+"""
+Сравнение IoC.resolve и заранее привязанного резолвера на горячем пути адаптеров,
+а также адаптеров, сгенерированных в обычном режиме и с прямой привязкой стратегий.
+
+Запуск: python -m benchmarks.ioc_resolve
+"""
+
+import timeit
+
+from app.core import ioc_scoped
+from app.core.command import ICommand
+from app.core.ioc import IoC, Resolver
+from app.game.behaviour.movement import IMovable
+from app.game.setup.behaviour import ioc_setup_imovable
+from app.game.uobject import UObjectImpl
+from app.game.value_types import Vector
+from codegen.adapter import template_adapter
+
+NUMBER = 1_000_000
+
+
+def main() -> None:
+    ioc_scoped.setup()
+    ioc_setup_imovable()
+
+    # Как в игре: Root -> EventLoop -> Game, стратегии лежат в Root
+    el_scope = IoC.resolve("IoC.Scope.Create", "EventLoop")
+    game_scope = IoC.resolve("IoC.Scope.Create", "Game", el_scope)
+    IoC[ICommand].resolve("IoC.Scope.Current.Set", game_scope).execute()
+
+    uobj = UObjectImpl()
+    uobj.set_property("movable_position", Vector(1, 2))
+    resolver = IoC[Resolver[Vector]].resolve("IoC.Resolver", "IMovable.position.Get")
+
+    adapters = {}
+    for direct in (False, True):
+        module: dict[str, object] = {}
+        exec(template_adapter(IMovable, direct=direct)[1], module)
+        adapters[direct] = module["MovableAdapter"](uobj)  # pyright: ignore[reportCallIssue]
+
+    namespace = {
+        "IoC": IoC,
+        "Vector": Vector,
+        "uobj": uobj,
+        "resolver": resolver,
+        "dynamic": adapters[False],
+        "direct": adapters[True],
+    }
+    cases = {
+        "IoC[Vector].resolve": 'IoC[Vector].resolve("IMovable.position.Get", uobj)',
+        "IoC.resolve": 'IoC.resolve("IMovable.position.Get", uobj)',
+        "Resolver": "resolver(uobj)",
+        "Adapter": "dynamic.get_position()",
+        "Adapter (direct)": "direct.get_position()",
+    }
+    for name, stmt in cases.items():
+        seconds = min(timeit.repeat(stmt, globals=namespace, number=NUMBER, repeat=3))
+        print(f"{name:>20}: {seconds / NUMBER * 1e9:7.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
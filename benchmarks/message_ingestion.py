@@ -0,0 +1,59 @@
+"""
+Прием сообщений через POST /message по одному и через POST /messages пакетами.
+
+Запуск: python -m benchmarks.message_ingestion
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from loguru import logger
+
+from app import endpoint
+from app.core import ioc_scoped
+from app.core.command import ICommand
+from app.core.ioc import IoC
+from app.game.setup.adapters import ioc_setup_adapters
+from app.server import Message, Server
+
+MESSAGES = 3000
+# Агент управляет тремя кораблями: три сообщения за ход
+BATCH = 3
+
+
+def _handle_noop(message: Message) -> None:
+    del message
+
+
+def main() -> None:
+    logger.remove()
+    ioc_scoped.setup()
+    ioc_setup_adapters()
+    IoC[ICommand].resolve("IoC.Scope.Register", "MessageHandler.noop", _handle_noop).execute()
+
+    server = Server(event_loop_count=2)
+    server.start()
+    client = TestClient(endpoint.app)
+    games = [client.post("/game").json() for _ in range(2)]
+    messages = [
+        {"game_id": games[i % 2], "object_id": i % BATCH, "op_id": "noop", "args": {}}
+        for i in range(MESSAGES)
+    ]
+
+    start = time.perf_counter()
+    for message in messages:
+        client.post("/message", json=message)
+    single = MESSAGES / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, MESSAGES, BATCH):
+        client.post("/messages", json=messages[i : i + BATCH])
+    batched = MESSAGES / (time.perf_counter() - start)
+
+    server.stop()
+    print(f"{'/message':>10}: {single:9.0f} messages/s")
+    print(f"{'/messages':>10}: {batched:9.0f} messages/s (batch of {BATCH})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Память на объект и время такта для объектов на словарях (UObjectImpl) и в массивах World.
+
+Запуск: python -m benchmarks.world_store
+"""
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+from loguru import logger
+
+from app.core import ioc_scoped
+from app.core.ioc import IoC
+from app.game.behaviour.movement import IMovable, MoveCommand
+from app.game.behaviour.systems import MOVE, MoveSystemCommand
+from app.game.setup.adapters import ioc_setup_adapters
+from app.game.setup.behaviour import ioc_setup_imovable
+from app.game.uobject import UObject, UObjectImpl
+from app.game.value_types import Angle, Vector
+from app.game.world import World
+
+OBJECTS = 1000
+NUMBER = 20
+
+
+def _fill(make: Callable[[], UObject]) -> list[UObject]:
+    objects = []
+    for i in range(OBJECTS):
+        uobj = make()
+        uobj.set_property("movable_position", Vector(i, -i))
+        uobj.set_property("movable_angle", Angle(i % 72))
+        uobj.set_property("movable_abs_velocity", 5)
+        objects.append(uobj)
+    return objects
+
+
+def _measure_memory(make: Callable[[], list[UObject]]) -> float:
+    tracemalloc.start()
+    objects = make()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / OBJECTS
+
+
+def main() -> None:
+    # Отладочный лог MoveCommand заглушил бы разницу
+    logger.remove()
+    ioc_scoped.setup()
+    ioc_setup_imovable()
+    ioc_setup_adapters()
+
+    world = World()
+    print(f"{'UObjectImpl':>20}: {_measure_memory(lambda: _fill(UObjectImpl)):7.1f} B/object")
+    print(f"{'World':>20}: {_measure_memory(lambda: _fill(World(OBJECTS).create)):7.1f} B/object")
+
+    dict_objects = _fill(UObjectImpl)
+    _fill(world.create)
+    commands = [MoveCommand(IoC[IMovable].resolve("Adapter", IMovable, o)) for o in dict_objects]
+
+    def tick_commands() -> None:
+        for cmd in commands:
+            cmd.execute()
+
+    move_system = MoveSystemCommand(world)
+    rows = np.flatnonzero(world.used)
+
+    def tick_system() -> None:
+        # Как и команды, система двигает объекты по просьбе на каждый квант
+        world.request(rows, MOVE)
+        move_system.execute()
+
+    cases = {"MoveCommand": tick_commands, "MoveSystemCommand": tick_system}
+    for name, tick in cases.items():
+        seconds = min(timeit.repeat(tick, number=NUMBER, repeat=3))
+        print(f"{name:>20}: {seconds / NUMBER * 1e3:7.3f} ms/tick ({OBJECTS} objects)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,52 @@
+import hashlib
+import marshal
+import sys
 from abc import ABCMeta
 from dataclasses import asdict, dataclass
+from functools import cache
 from pathlib import Path
-from types import FunctionType
+from types import CodeType, FunctionType
+from typing import Any
 
 from loguru import logger
 
-from app.core.command import ICommand
-from app.core.ioc import IoC
-from app.game.uobject import UObject
-from codegen.common import camel2snake, create_jinja_env, parse_type
+from app.core.command import Action, ICommand
+from app.core.ioc import IoC, Resolver, Version
+from app.game.uobject import UObject, bind_strategy
+from codegen.common import TEMPLATES_DIR, camel2snake, create_jinja_env, parse_type
 
+FINGERPRINT_PREFIX = "# fingerprint: "
 
-def create_adapters(interfaces: list[ABCMeta], destination: Path) -> None:
+
+def create_adapters(interfaces: list[ABCMeta], destination: Path, *, direct: bool = False) -> None:
     """
     Генерирует и сохраняет код адаптеров по интерфейсам.
+    direct - адаптеры с прямой привязкой стратегий (см. template_adapter).
+    Первая строка файла - отпечаток интерфейса и шаблона: адаптеры с тем же отпечатком
+    не перегенерируются. Файлы адаптеров интерфейсов, которых больше нет, удаляются.
     """
     destination.mkdir(exist_ok=True)
     (destination / "__init__.py").touch()
 
+    filenames: set[str] = set()
     for interface in interfaces:
+        context = _generate_template_context(interface, direct=direct)
+        filenames.add(context.filename)
+        path = destination / context.filename
+        header = f"{FINGERPRINT_PREFIX}{_fingerprint(context, direct=direct)}\n"
+        if path.exists():
+            with path.open() as file:
+                if file.readline() == header:
+                    continue
+
         logger.info(f"Generating adapter for '{interface.__name__}'")
-        filename, adapter_str = template_adapter(interface)
-        Path(destination / filename).write_text(adapter_str)
+        _, adapter_str = template_adapter(interface, direct=direct)
+        path.write_text(header + adapter_str)
+
+    for path in destination.glob("*_adapter.py"):
+        if path.name not in filenames:
+            logger.info(f"Removing stale adapter '{path.name}'")
+            path.unlink()
 
 
 @dataclass
@@ -48,18 +73,76 @@ class Adapter:
     methods: list[Method]
 
 
-def template_adapter(interface: type) -> tuple[str, str]:
+@cache
+def build_adapter(interface: type, *, direct: bool = True, cache_dir: Path | None = None) -> type:
+    """
+    Собирает класс адаптера в памяти, без записи исходников на диск и импорта модулей.
+    Класс собирается один раз на интерфейс.
+    Если задан cache_dir, скомпилированный код сохраняется туда под хешем интерфейса
+    и шаблона, и следующий запуск берет его оттуда, не рендеря шаблон.
+    Интерфейс должен быть объявлен на уровне модуля: сгенерированный код его импортирует.
+    """
+    context = _generate_template_context(interface, direct=direct)
+
+    code: CodeType | None = None
+    cache_file: Path | None = None
+    if cache_dir is not None:
+        # Формат marshal зависит от версии интерпретатора
+        key = _fingerprint(context, direct=direct, salt=sys.implementation.cache_tag)
+        cache_file = cache_dir / f"{context.class_name}-{key}.bin"
+        if cache_file.exists():
+            code = marshal.loads(cache_file.read_bytes())
+
+    if code is None:
+        _, adapter_str = template_adapter(interface, direct=direct)
+        code = compile(adapter_str, f"<adapter {context.class_name}>", "exec")
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Запись через временный файл: параллельно стартующие процессы не прочтут половину
+            tmp = cache_file.with_suffix(f".{id(code)}.tmp")
+            tmp.write_bytes(marshal.dumps(code))
+            tmp.replace(cache_file)
+
+    namespace: dict[str, Any] = {"__name__": interface.__module__}
+    exec(code, namespace)
+    return namespace[context.class_name]
+
+
+def _fingerprint(context: Adapter, *, direct: bool, salt: str = "") -> str:
+    """
+    Хеш всего, от чего зависит код адаптера: методов и аннотаций интерфейса и шаблона
+    """
+    template = "adapter_direct.j2" if direct else "adapter.j2"
+    return hashlib.sha256(
+        repr(asdict(context)).encode() + (TEMPLATES_DIR / template).read_bytes() + salt.encode()
+    ).hexdigest()[:16]
+
+
+def template_adapter(interface: type, *, direct: bool = False) -> tuple[str, str]:
+    """
+    Обычный адаптер на каждый вызов вызывает резолвер стратегии.
+    Адаптер с прямой привязкой (direct) при первом вызове привязывает стратегии к объекту,
+    а стратегии PropertyGetter и PropertySetter - прямо к get_property и set_property объекта.
+    Стратегии привязываются заново, только если в IoC зарегистрировали новые зависимости.
+    """
     env = create_jinja_env()
-    template = env.get_template("adapter.j2")
-    context = _generate_template_context(interface)
-    adapter_str = template.render(asdict(context))
+    template = env.get_template("adapter_direct.j2" if direct else "adapter.j2")
+    context = _generate_template_context(interface, direct=direct)
+    adapter_str = template.render(
+        asdict(context),
+        bound_names=[
+            *(f"get_{prop.name}" for prop in context.get_properties),
+            *(f"set_{prop.name}" for prop in context.set_properties),
+            *(method.name for method in context.methods),
+        ],
+    )
     return context.filename, adapter_str
 
 
-def _generate_template_context(interface: type) -> Adapter:
+def _generate_template_context(interface: type, *, direct: bool) -> Adapter:
     class_name: str = interface.__name__[1:] + "Adapter"
 
-    imports = [(cls.__module__, cls.__name__) for cls in (ICommand, IoC, UObject, interface)]
+    imports = [(cls.__module__, cls.__name__) for cls in (IoC, UObject, interface)]
     set_properties: list[Variable] = []
     get_properties: list[Variable] = []
     methods: list[Method] = []
@@ -102,6 +185,18 @@ def _generate_template_context(interface: type) -> Adapter:
                 )
             )
 
+    # Импортируем только то, что используется в сгенерированном коде
+    used: list[Any] = []
+    if direct:
+        used.extend((Version, bind_strategy))
+    if set_properties and not direct:
+        used.append(Action)
+    if any(method.return_type == "None" for method in methods):
+        used.append(ICommand)
+    if get_properties or methods or (set_properties and direct):
+        used.append(Resolver)
+    imports.extend((cls.__module__, cls.__name__) for cls in used)
+
     return Adapter(
         filename=f"{camel2snake(class_name)}.py",
         imports=sorted(set(imports)),
@@ -1,14 +1,19 @@
 import re
 from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
 from types import GenericAlias, UnionType
 from typing import Any
 
 import jinja2
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+
+@cache
 def create_jinja_env() -> jinja2.Environment:
     return jinja2.Environment(
-        loader=jinja2.FileSystemLoader("codegen/templates"),
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
         undefined=jinja2.StrictUndefined,
         trim_blocks=True,
         lstrip_blocks=True,
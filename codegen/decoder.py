@@ -0,0 +1,27 @@
+import inspect
+from collections.abc import Callable
+from functools import cache
+from typing import Any, get_type_hints
+
+from pydantic import TypeAdapter
+
+Decoder = Callable[[dict[str, Any]], Any]
+
+
+def build_decoder(handler: Callable[..., None]) -> Decoder | None:
+    """
+    Декодер аргументов сообщения для обработчика handler(message, args).
+    Тип args берется из аннотации обработчика (обычно dataclass со slots),
+    TypeAdapter pydantic строится один раз на тип.
+    None, если обработчик принимает только сообщение.
+    """
+    parameters = list(inspect.signature(handler).parameters)
+    if len(parameters) < 2:
+        return None
+    args_type = get_type_hints(handler)[parameters[1]]
+    return _type_adapter(args_type).validate_python
+
+
+@cache
+def _type_adapter(args_type: type) -> TypeAdapter[Any]:
+    return TypeAdapter(args_type)
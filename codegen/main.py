@@ -1,3 +1,4 @@
+import argparse
 import contextlib
 import importlib
 import pkgutil
@@ -6,12 +7,22 @@ from pathlib import Path
 
 import app
 from codegen import adapter
-from codegen.decorators import requested_adapter
+from codegen.decorators import generate_adapter, requested_adapter
 
 
 def main() -> None:
-    # Рекурсивно импортировать пакет app, отработали декораторы
+    parser = argparse.ArgumentParser(description="Генерация кода адаптеров")
+    parser.add_argument(
+        "--dynamic",
+        action="store_true",
+        help="адаптеры, которые на каждый вызов обращаются к резолверу стратегии",
+    )
+    args = parser.parse_args()
+
+    # Рекурсивно импортировать модули пакета app с интерфейсами, чтобы отработали декораторы
     for module in pkgutil.walk_packages(app.__path__, app.__name__ + "."):
+        if not _uses_generate_adapter(module):
+            continue
         # Ошибки импорта будут в модулях, которые импортируют сгенерированный код
         with contextlib.suppress(ImportError):
             importlib.import_module(module.name)
@@ -19,11 +30,21 @@ def main() -> None:
     destination = Path("app/autogenerated")
     destination.mkdir(exist_ok=True)
 
-    generate_adapters(requested_adapter, destination / "adapters")
+    generate_adapters(requested_adapter, destination / "adapters", direct=not args.dynamic)
 
 
-def generate_adapters(interfaces: list[ABCMeta], destination: Path) -> None:
-    adapter.create_adapters(interfaces, destination)
+def _uses_generate_adapter(module: pkgutil.ModuleInfo) -> bool:
+    """
+    Модули без generate_adapter в исходнике можно не импортировать
+    """
+    spec = module.module_finder.find_spec(module.name, None)  # pyright: ignore[reportCallIssue]
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return True
+    return generate_adapter.__name__ in Path(spec.origin).read_text()
+
+
+def generate_adapters(interfaces: list[ABCMeta], destination: Path, *, direct: bool) -> None:
+    adapter.create_adapters(interfaces, destination, direct=direct)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,22 @@
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any
 
-from app.core.command import ICommand
-from app.core.ioc import IoC
-from app.game.uobject import UObject
+from pytest_mock import MockerFixture
+
+import codegen.adapter
+from app.core.command import Action, ICommand
+from app.core.ioc import IoC, Resolver, Version
+from app.game.uobject import UObject, bind_strategy
 from app.game.value_types import Vector
-from codegen.adapter import template_adapter
+from codegen.adapter import FINGERPRINT_PREFIX, build_adapter, create_adapters, template_adapter
 
 GETTER_ADAPTER = f"""
 from typing import override
 
-from {ICommand.__module__} import ICommand
 from {IoC.__module__} import IoC
+from {Resolver.__module__} import Resolver
 from {UObject.__module__} import UObject
 from {Vector.__module__} import Vector
 from {__name__} import ITestGetter
@@ -21,13 +25,14 @@ from {__name__} import ITestGetter
 class TestGetterAdapter(ITestGetter):
     def __init__(self, uobject: UObject) -> None:
         self._uobject = uobject
+        self._get_something_resolver = IoC[Resolver[Vector | int | None]].resolve(
+            "IoC.Resolver",
+            "ITestGetter.something.Get",
+        )
 
     @override
     def get_something(self) -> Vector | int | None:
-        return IoC[Vector | int | None].resolve(
-            "ITestGetter.something.Get",
-            self._uobject,
-        )
+        return self._get_something_resolver(self._uobject)
 """.strip()
 
 
@@ -44,7 +49,7 @@ def test_getter() -> None:
 SETTER_ADAPTER = f"""
 from typing import override
 
-from {ICommand.__module__} import ICommand
+from {Action.__module__} import Action
 from {IoC.__module__} import IoC
 from {UObject.__module__} import UObject
 from {Vector.__module__} import Vector
@@ -54,14 +59,14 @@ from {__name__} import ITestSetter
 class TestSetterAdapter(ITestSetter):
     def __init__(self, uobject: UObject) -> None:
         self._uobject = uobject
+        self._set_something_resolver = IoC[Action].resolve(
+            "IoC.Resolver",
+            "ITestSetter.something.Set",
+        )
 
     @override
     def set_something(self, value: list[Vector]) -> None:
-        IoC[ICommand].resolve(
-            "ITestSetter.something.Set",
-            self._uobject,
-            value,
-        ).execute()
+        self._set_something_resolver(self._uobject, value)
 """.strip()
 
 
@@ -80,6 +85,7 @@ from typing import override
 
 from {ICommand.__module__} import ICommand
 from {IoC.__module__} import IoC
+from {Resolver.__module__} import Resolver
 from {UObject.__module__} import UObject
 from {Vector.__module__} import Vector
 from {__name__} import IArbitraryMethods
@@ -88,13 +94,20 @@ from {__name__} import IArbitraryMethods
 class ArbitraryMethodsAdapter(IArbitraryMethods):
     def __init__(self, uobject: UObject) -> None:
         self._uobject = uobject
+        self._finish_resolver = IoC[Resolver[ICommand]].resolve(
+            "IoC.Resolver",
+            "IArbitraryMethods.finish",
+        )
+        self._calculate_something_resolver = IoC[Resolver[list[float]]].resolve(
+            "IoC.Resolver",
+            "IArbitraryMethods.calculate_something",
+        )
 
     @override
     def finish(
         self,
     ) -> None:
-        IoC[ICommand].resolve(
-            "IArbitraryMethods.finish",
+        self._finish_resolver(
             self._uobject,
         ).execute()
 
@@ -104,8 +117,7 @@ class ArbitraryMethodsAdapter(IArbitraryMethods):
         vec: Vector,
         aa: int,
     ) -> list[float]:
-        return IoC[list[float]].resolve(
-            "IArbitraryMethods.calculate_something",
+        return self._calculate_something_resolver(
             self._uobject,
             vec,
             aa,
@@ -135,8 +147,10 @@ def test_arbitrary() -> None:
 BIG_INTERFACE_ADAPTER = f"""
 from typing import override
 
+from {Action.__module__} import Action
 from {ICommand.__module__} import ICommand
 from {IoC.__module__} import IoC
+from {Resolver.__module__} import Resolver
 from {UObject.__module__} import UObject
 from {Vector.__module__} import Vector
 from {__name__} import IBigInterface
@@ -146,35 +160,44 @@ from typing import Any
 class BigInterfaceAdapter(IBigInterface):
     def __init__(self, uobject: UObject) -> None:
         self._uobject = uobject
+        self._get_something_resolver = IoC[Resolver[Vector]].resolve(
+            "IoC.Resolver",
+            "IBigInterface.something.Get",
+        )
+        self._get_something_else_resolver = IoC[Resolver[int]].resolve(
+            "IoC.Resolver",
+            "IBigInterface.something_else.Get",
+        )
+        self._set_something_resolver = IoC[Action].resolve(
+            "IoC.Resolver",
+            "IBigInterface.something.Set",
+        )
+        self._finish_resolver = IoC[Resolver[ICommand]].resolve(
+            "IoC.Resolver",
+            "IBigInterface.finish",
+        )
+        self._calculate_something_resolver = IoC[Resolver[list[float]]].resolve(
+            "IoC.Resolver",
+            "IBigInterface.calculate_something",
+        )
 
     @override
     def get_something(self) -> Vector:
-        return IoC[Vector].resolve(
-            "IBigInterface.something.Get",
-            self._uobject,
-        )
+        return self._get_something_resolver(self._uobject)
 
     @override
     def get_something_else(self) -> int:
-        return IoC[int].resolve(
-            "IBigInterface.something_else.Get",
-            self._uobject,
-        )
+        return self._get_something_else_resolver(self._uobject)
 
     @override
     def set_something(self, value: Vector) -> None:
-        IoC[ICommand].resolve(
-            "IBigInterface.something.Set",
-            self._uobject,
-            value,
-        ).execute()
+        self._set_something_resolver(self._uobject, value)
 
     @override
     def finish(
         self,
     ) -> None:
-        IoC[ICommand].resolve(
-            "IBigInterface.finish",
+        self._finish_resolver(
             self._uobject,
         ).execute()
 
@@ -184,8 +207,7 @@ class BigInterfaceAdapter(IBigInterface):
         vec: Vector,
         aa: Callable[[int, dict[str, Any]], Vector],
     ) -> list[float]:
-        return IoC[list[float]].resolve(
-            "IBigInterface.calculate_something",
+        return self._calculate_something_resolver(
             self._uobject,
             vec,
             aa,
@@ -215,3 +237,131 @@ def test_everything_together() -> None:
     filename, content = template_adapter(IBigInterface)
     assert filename == "big_interface_adapter.py"
     assert content.strip() == BIG_INTERFACE_ADAPTER
+
+
+DIRECT_ADAPTER = f"""
+from typing import override
+
+from {ICommand.__module__} import ICommand
+from {IoC.__module__} import IoC
+from {Resolver.__module__} import Resolver
+from {Version.__module__} import Version
+from {UObject.__module__} import UObject
+from {bind_strategy.__module__} import bind_strategy
+from {Vector.__module__} import Vector
+from {__name__} import ITestDirect
+
+
+class TestDirectAdapter(ITestDirect):
+    def __init__(self, uobject: UObject) -> None:
+        self._uobject = uobject
+        self._ioc_version = IoC[Version].resolve("IoC.Version")
+        # Стратегии привязываются по отдельности при вызове своего метода.
+        # Версия сохраняется только после привязки: незарегистрированная стратегия
+        # ломает только свой метод, и он попробует привязаться снова при следующем вызове
+        self._get_something_version = -1
+        self._set_something_version = -1
+        self._finish_version = -1
+        self._get_something_resolver = IoC[Resolver[Vector]].resolve(
+            "IoC.Resolver",
+            "ITestDirect.something.Get",
+        )
+        self._set_something_resolver = IoC[Resolver[None]].resolve(
+            "IoC.Resolver",
+            "ITestDirect.something.Set",
+        )
+        self._finish_resolver = IoC[Resolver[ICommand]].resolve(
+            "IoC.Resolver",
+            "ITestDirect.finish",
+        )
+
+    @override
+    def get_something(self) -> Vector:
+        if self._get_something_version != self._ioc_version.value:
+            version = self._ioc_version.value
+            self._get_something = bind_strategy(
+                self._get_something_resolver.strategy(),
+                self._uobject,
+            )
+            self._get_something_version = version
+        return self._get_something()
+
+    @override
+    def set_something(self, value: Vector) -> None:
+        if self._set_something_version != self._ioc_version.value:
+            version = self._ioc_version.value
+            self._set_something = bind_strategy(
+                self._set_something_resolver.strategy(),
+                self._uobject,
+            )
+            self._set_something_version = version
+        self._set_something(value)
+
+    @override
+    def finish(
+        self,
+    ) -> None:
+        if self._finish_version != self._ioc_version.value:
+            version = self._ioc_version.value
+            self._finish = bind_strategy(
+                self._finish_resolver.strategy(),
+                self._uobject,
+            )
+            self._finish_version = version
+        self._finish().execute()
+""".strip()
+
+
+def test_direct() -> None:
+    class ITestDirect(ABC):
+        @abstractmethod
+        def get_something(self) -> Vector: ...
+
+        @abstractmethod
+        def set_something(self, value: Vector) -> None: ...
+
+        @abstractmethod
+        def finish(self) -> None: ...
+
+    filename, content = template_adapter(ITestDirect, direct=True)
+    assert filename == "test_direct_adapter.py"
+    assert content.strip() == DIRECT_ADAPTER
+
+
+class ITestBuild(ABC):
+    @abstractmethod
+    def get_something(self) -> Vector: ...
+
+
+def test_build_adapter(tmp_path: Path, mocker: MockerFixture) -> None:
+    build_adapter.cache_clear()
+    adapter = build_adapter(ITestBuild, cache_dir=tmp_path)
+    assert adapter.__name__ == "TestBuildAdapter"
+    assert issubclass(adapter, ITestBuild)
+    assert build_adapter(ITestBuild, cache_dir=tmp_path) is adapter
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Новый процесс берет скомпилированный код из каталога, не рендеря шаблон
+    build_adapter.cache_clear()
+    template = mocker.patch("codegen.adapter.template_adapter")
+    assert build_adapter(ITestBuild, cache_dir=tmp_path).__name__ == "TestBuildAdapter"
+    template.assert_not_called()
+    build_adapter.cache_clear()
+
+
+def test_create_adapters_incremental(tmp_path: Path, mocker: MockerFixture) -> None:
+    (tmp_path / "stale_adapter.py").write_text("")
+    create_adapters([ITestBuild], tmp_path, direct=True)
+    written = (tmp_path / "test_build_adapter.py").read_text()
+    assert written.startswith(FINGERPRINT_PREFIX)
+    assert not (tmp_path / "stale_adapter.py").exists()
+
+    # Интерфейс и шаблон не менялись: файл не перегенерируется
+    template = mocker.spy(codegen.adapter, "template_adapter")
+    create_adapters([ITestBuild], tmp_path, direct=True)
+    template.assert_not_called()
+
+    # Другой шаблон - другой отпечаток
+    create_adapters([ITestBuild], tmp_path, direct=False)
+    template.assert_called_once()
+    assert (tmp_path / "test_build_adapter.py").read_text() != written